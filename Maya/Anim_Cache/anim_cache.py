@@ -0,0 +1,223 @@
+"""
+Baked animation cache shared by the tools.
+
+Evaluates the animation curves of some objects over a frame range once and
+keeps the values as a frames x channels array of doubles, so the tools can
+read values, find extremes and blend poses without querying Maya for every
+frame. A cache can be saved to disk and memory-mapped back. Editing any of
+its curves, or opening another scene, invalidates it.
+
+Usage:
+    import anim_cache
+
+    cache = anim_cache.bake(cmds.ls(selection=True), 1, 120)
+    cache.value("pCube1.translateX", 42)
+    cache.extremes("pCube1.translateX")   # ((frame, min value), (frame, max value))
+    cache.save("C:/tmp/shot.animcache")
+
+    cache = anim_cache.AnimCache.load("C:/tmp/shot.animcache", use_mmap=True)
+    anim_cache.lookup(curves, 42)          # values from any valid cache, or None
+"""
+
+import array
+import json
+import mmap
+import struct
+
+import maya.api.OpenMaya as om2
+import maya.cmds as cmds
+
+
+FILE_MAGIC = b"ANIMCACHE2"
+# doubles, files starting with LEGACY_MAGIC hold float32 values
+LEGACY_MAGIC = b"ANIMCACHE1"
+
+TIME_CURVE_TYPES = ["animCurveTA", "animCurveTL", "animCurveTT", "animCurveTU"]
+# set driven key curves (animCurveU*) are not keyed on time and are not baked
+
+caches = []
+# baked caches that are still valid, most recent last
+scene_callbacks = []
+# clear the caches when another scene is opened, curve names may be reused
+
+
+class AnimCache(object):
+    """
+    Values of channels (plug and driving curve) for every whole frame from
+    start to end, stored frame by frame
+    """
+
+    def __init__(self, plugs, curves, start, end, values=None, typecode="d"):
+        self.plugs = plugs
+        self.curves = curves
+        self.start = int(start)
+        self.end = int(end)
+        self.typecode = typecode
+        # "f" for caches loaded from legacy files
+        self.values = values if values is not None else array.array(typecode)
+        self.valid = True
+
+        self.channel_index = dict((plug, i) for i, plug in enumerate(plugs))
+        self.curve_index = dict((curve, i) for i, curve in enumerate(curves))
+        self.data_offset = 0
+        # where the values start when self.values is a memory-mapped file
+        self.callback = None
+
+    @classmethod
+    def bake(cls, objs, start, end):
+        """
+        One connection query for the channels, one keyframe evaluation per frame
+        """
+        connections = cmds.listConnections(objs, source=True, destination=False, type="animCurve", connections=True, plugs=True) or []
+        plugs = connections[0::2]
+        curves = [plug.split(".", 1)[0] for plug in connections[1::2]]
+
+        unique_curves = sorted(set(cmds.ls(list(set(curves)), type=TIME_CURVE_TYPES) or [])) if curves else []
+        channels = [(plug, curve) for plug, curve in zip(plugs, curves) if curve in unique_curves]
+        plugs = [plug for plug, curve in channels]
+        curves = [curve for plug, curve in channels]
+        columns = dict((curve, n) for n, curve in enumerate(unique_curves))
+        # keyframe returns one value per curve, a curve driving several plugs only once
+
+        cache = cls(plugs, curves, start, end)
+        for frame in range(cache.start, cache.end + 1):
+            row = cmds.keyframe(unique_curves, query=True, eval=True, time=(frame, frame)) if unique_curves else []
+            cache.values.extend(row[columns[curve]] for curve in curves)
+
+        return cache
+
+    @property
+    def frame_count(self):
+        return self.end - self.start + 1
+
+    def get(self, index):
+        if isinstance(self.values, array.array):
+            return self.values[index]
+        return struct.unpack_from("<" + self.typecode, self.values, self.data_offset + index * self.item_size)[0]
+
+    @property
+    def item_size(self):
+        return struct.calcsize("<" + self.typecode)
+
+    def value(self, plug, frame):
+        return self.get((int(frame) - self.start) * len(self.plugs) + self.channel_index[plug])
+
+    def row(self, frame, curves=None):
+        """
+        Values of all channels (or of the given curves) at a whole frame
+        """
+        first = (int(frame) - self.start) * len(self.plugs)
+        if curves is None:
+            return [self.get(first + i) for i in range(len(self.plugs))]
+        return [self.get(first + self.curve_index[curve]) for curve in curves]
+
+    def channel(self, plug):
+        i = self.channel_index[plug]
+        return [self.get(frame * len(self.plugs) + i) for frame in range(self.frame_count)]
+
+    def extremes(self, plug):
+        """
+        ((frame, min value), (frame, max value)) of one channel
+        """
+        values = self.channel(plug)
+        low = min(range(len(values)), key=values.__getitem__)
+        high = max(range(len(values)), key=values.__getitem__)
+        return (self.start + low, values[low]), (self.start + high, values[high])
+
+    def covers(self, curves, time):
+        return (self.valid and time == int(time) and self.start <= time <= self.end
+                and all(curve in self.curve_index for curve in curves))
+
+    def watch(self):
+        """
+        Invalidate the cache as soon as one of its curves is edited
+        """
+        if self.callback is None:
+            self.callback = om2.MAnimMessage.addAnimCurveEditedCallback(self.on_curves_edited)
+
+    def on_curves_edited(self, edited_curves, *args):
+        for i in range(len(edited_curves)):
+            if om2.MFnDependencyNode(edited_curves[i]).name() in self.curve_index:
+                self.invalidate()
+                return
+
+    def invalidate(self):
+        self.valid = False
+        if self.callback is not None:
+            om2.MMessage.removeCallback(self.callback)
+            self.callback = None
+        if self in caches:
+            caches.remove(self)
+
+    def save(self, file_path):
+        """
+        Header (channels and range as JSON) followed by the raw double values
+        """
+        header = json.dumps({"plugs": self.plugs, "curves": self.curves, "start": self.start, "end": self.end}).encode("utf-8")
+        values = [self.get(i) for i in range(self.frame_count * len(self.plugs))]
+
+        with open(file_path, "wb") as f:
+            f.write(FILE_MAGIC)
+            f.write(struct.pack("<I", len(header)))
+            f.write(header)
+            f.write(struct.pack("<{0}d".format(len(values)), *values))
+
+    @classmethod
+    def load(cls, file_path, use_mmap=False):
+        """
+        With use_mmap the values stay on disk and are paged in as they are read
+        """
+        with open(file_path, "rb") as f:
+            magic = f.read(len(FILE_MAGIC))
+            if magic not in (FILE_MAGIC, LEGACY_MAGIC):
+                raise ValueError("{0} is not an animation cache".format(file_path))
+            typecode = "d" if magic == FILE_MAGIC else "f"
+            header_size = struct.unpack("<I", f.read(4))[0]
+            header = json.loads(f.read(header_size).decode("utf-8"))
+            data_offset = len(FILE_MAGIC) + 4 + header_size
+
+            if use_mmap:
+                values = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+            else:
+                values = array.array(typecode)
+                values.fromstring(f.read())
+
+        cache = cls(header["plugs"], header["curves"], header["start"], header["end"], values, typecode)
+        if use_mmap:
+            cache.data_offset = data_offset
+        return cache
+
+
+def bake(objs, start, end):
+    """
+    Bake and register a cache the tools will read from until its curves change
+    """
+    cache = AnimCache.bake(objs, start, end)
+    cache.watch()
+    caches.append(cache)
+    watch_scene()
+    return cache
+
+
+def lookup(curves, time):
+    """
+    Values of the curves at time from a valid cache, or None if no cache has them
+    """
+    for cache in reversed(caches):
+        if cache.covers(curves, time):
+            return cache.row(time, curves)
+    return None
+
+
+def clear(*args):
+    for cache in list(caches):
+        cache.invalidate()
+
+
+def watch_scene():
+    """
+    Clear every cache when a scene is opened or a new one is started
+    """
+    if not scene_callbacks:
+        for message in (om2.MSceneMessage.kAfterOpen, om2.MSceneMessage.kAfterNew):
+            scene_callbacks.append(om2.MSceneMessage.addCallback(message, clear))
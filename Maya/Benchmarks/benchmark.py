@@ -0,0 +1,415 @@
+"""
+Benchmark harness for the tools in this repo.
+
+Builds synthetic scenes of a given size, runs each tool's hot path against
+them and records wall-clock time plus the maya.cmds calls made by the tool
+(counted by Cmds_Profiler). Results are written as JSON so two runs (e.g. two
+commits) can be compared with the "compare" command, which does not need Maya.
+
+Usage:
+    mayapy benchmark.py run --sizes small,medium --output results.json
+    python benchmark.py compare baseline.json results.json
+
+Inside a Maya session:
+    import benchmark
+    benchmark.run_benchmarks(["small"], output="C:/tmp/results.json")
+"""
+
+import argparse
+import json
+import os
+import platform
+import subprocess
+import sys
+import tempfile
+import timeit
+
+
+MAYA_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+TOOL_DIRS = ["Import_Save", "Key_Reducer", "Object_Renamer", "Retiming_Tool", "Simple_Tweener", "Transform_Obj", "Undo_Journal", "Wireframe_Color", "Cmds_Profiler", "Anim_Cache"]
+
+# nodes: mesh transforms in the scene
+# keys: keys per animation curve
+# curves: animation curves in the rig (9 per control, one per TRS channel)
+# file_nodes: meshes saved into the scene file used for load/save timings
+SIZES = {
+    "small": {"nodes": 100, "keys": 50, "curves": 18, "file_nodes": 100},
+    "medium": {"nodes": 1000, "keys": 250, "curves": 90, "file_nodes": 1000},
+    "large": {"nodes": 10000, "keys": 1000, "curves": 450, "file_nodes": 10000},
+}
+
+TRS_ATTRS = ["tx", "ty", "tz", "rx", "ry", "rz", "sx", "sy", "sz"]
+
+
+def add_tool_paths():
+    """
+    Make every tool module importable by its module name
+    """
+    for tool_dir in TOOL_DIRS:
+        path = os.path.join(MAYA_DIR, tool_dir)
+        if path not in sys.path:
+            sys.path.append(path)
+
+
+def get_commit():
+    try:
+        return subprocess.check_output(["git", "rev-parse", "HEAD"], cwd=MAYA_DIR).decode("ascii").strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+class SceneBuilder(object):
+    """
+    Creates the synthetic scenes the benchmarks run against
+    """
+
+    @classmethod
+    def new_scene(cls):
+        import maya.cmds as cmds
+        cmds.file(new=True, force=True)
+
+    @classmethod
+    def build_meshes(cls, count):
+        import maya.cmds as cmds
+
+        transforms = []
+        for i in range(count):
+            transform = cmds.polyCube(name="bench_cube_{0}".format(i), constructionHistory=False)[0]
+            cmds.setAttr("{0}.translate".format(transform), i, i * 0.5, -i)
+            transforms.append(transform)
+
+        return transforms
+
+    @classmethod
+    def build_rig(cls, curves, keys):
+        """
+        Keys are placed every 2 frames so odd frames always sit between two keys
+        """
+        import maya.cmds as cmds
+
+        controls = []
+        remaining = curves
+        index = 0
+        while remaining > 0:
+            control = cmds.spaceLocator(name="bench_ctrl_{0}".format(index))[0]
+            attrs = TRS_ATTRS[:min(remaining, len(TRS_ATTRS))]
+            for attr_index, attr in enumerate(attrs):
+                for key in range(keys):
+                    cmds.setKeyframe(control, attribute=attr, time=key * 2 + 1, value=(key + attr_index) % 7)
+
+            controls.append(control)
+            remaining -= len(attrs)
+            index += 1
+
+        return controls
+
+
+class Benchmarks(object):
+    """
+    Each benchmark_<name> method sets up its scene, then returns the
+    (modules, operation) pair to time. Only the operation is timed and counted.
+    """
+
+    @classmethod
+    def names(cls):
+        return sorted(name[len("benchmark_"):] for name in dir(cls) if name.startswith("benchmark_"))
+
+    @classmethod
+    def benchmark_retime_keys(cls, size):
+        import maya.cmds as cmds
+        import retiming_tool
+
+        SceneBuilder.new_scene()
+        controls = SceneBuilder.build_rig(size["curves"], size["keys"])
+        cmds.select(controls)
+        range_end = size["keys"] // 2
+
+        class FixedRangeHelper(retiming_tool.HelperMethods):
+            # the playback slider only exists in an interactive session
+            @classmethod
+            def get_selected_range(cls):
+                return [1.0, float(range_end)]
+
+        return [retiming_tool], lambda: FixedRangeHelper.retime_keys(2, False)
+
+    @classmethod
+    def benchmark_reduce_keys(cls, size):
+        import maya.cmds as cmds
+        import key_reducer
+        import undo_journal
+
+        SceneBuilder.new_scene()
+        cmds.select(SceneBuilder.build_rig(size["curves"], size["keys"]))
+
+        return [key_reducer, undo_journal], lambda: key_reducer.KeyReducer.reduce_selection(0.01)
+
+    @classmethod
+    def benchmark_tween(cls, size):
+        import maya.cmds as cmds
+        import tweener
+        import undo_journal
+
+        SceneBuilder.new_scene()
+        controls = SceneBuilder.build_rig(size["curves"], size["keys"])
+        cmds.currentTime(size["keys"])
+
+        def operation():
+            for control in controls:
+                tweener.tween(50, obj=control)
+
+        return [tweener, undo_journal], operation
+
+    @classmethod
+    def benchmark_refresh_table(cls, size):
+        import tranform_obj
+
+        SceneBuilder.new_scene()
+        SceneBuilder.build_meshes(size["nodes"])
+        dialog = tranform_obj.TransformTableDialog(parent=None)
+
+        return [tranform_obj], dialog.refresh_table
+
+    @classmethod
+    def benchmark_refresh_tree(cls, size):
+        import tranform_obj
+
+        SceneBuilder.new_scene()
+        SceneBuilder.build_meshes(size["nodes"])
+        dialog = tranform_obj.TransformTableDialog(parent=None)
+
+        return [tranform_obj], dialog.refresh_tree
+
+    @classmethod
+    def benchmark_rename_obj(cls, size):
+        return cls.renamer_case(size, "rename_obj", rename_le="bench_renamed")
+
+    @classmethod
+    def benchmark_find_replace(cls, size):
+        return cls.renamer_case(size, "find_replace", find_le="cube", replace_le="box")
+
+    @classmethod
+    def benchmark_add_prefix(cls, size):
+        return cls.renamer_case(size, "add_prefix", prefix_le="pre_")
+
+    @classmethod
+    def benchmark_add_suffix(cls, size):
+        return cls.renamer_case(size, "add_suffix", suffix_le="_geo")
+
+    @classmethod
+    def renamer_case(cls, size, method, **line_edit_texts):
+        import maya.cmds as cmds
+        import object_renamer
+        import undo_journal
+
+        SceneBuilder.new_scene()
+        cmds.select(SceneBuilder.build_meshes(size["nodes"]))
+        dialog = object_renamer.ObjectRenamerDialog(parent=None)
+        for line_edit, text in line_edit_texts.items():
+            getattr(dialog, line_edit).setText(text)
+
+        return [object_renamer, undo_journal], getattr(dialog, method)
+
+    @classmethod
+    def benchmark_set_random_colors(cls, size):
+        import maya.cmds as cmds
+        import undo_journal
+        import wireframe_colors
+
+        SceneBuilder.new_scene()
+        cmds.select(SceneBuilder.build_meshes(size["nodes"]))
+
+        return [wireframe_colors, undo_journal], wireframe_colors.WireframeColors.set_random_colors
+
+    @classmethod
+    def benchmark_scene_save_ma(cls, size):
+        return cls.scene_save_case(size, "ma", "mayaAscii")
+
+    @classmethod
+    def benchmark_scene_save_mb(cls, size):
+        return cls.scene_save_case(size, "mb", "mayaBinary")
+
+    @classmethod
+    def scene_save_case(cls, size, extension, file_type):
+        import maya.cmds as cmds
+
+        SceneBuilder.new_scene()
+        SceneBuilder.build_meshes(size["file_nodes"])
+        file_path = cls.scene_file_path(size, extension)
+
+        def operation():
+            cmds.file(rename=file_path)
+            cmds.file(save=True, force=True, type=file_type)
+
+        return [], operation
+
+    @classmethod
+    def benchmark_scene_load_ma(cls, size):
+        return cls.scene_load_case(size, "ma", "mayaAscii")
+
+    @classmethod
+    def benchmark_scene_load_mb(cls, size):
+        return cls.scene_load_case(size, "mb", "mayaBinary")
+
+    @classmethod
+    def scene_load_case(cls, size, extension, file_type):
+        import maya.cmds as cmds
+
+        file_path = cls.scene_file_path(size, extension)
+        if not os.path.exists(file_path):
+            cls.scene_save_case(size, extension, file_type)[1]()
+        SceneBuilder.new_scene()
+
+        return [], lambda: cmds.file(file_path, open=True, force=True)
+
+    @classmethod
+    def scene_file_path(cls, size, extension):
+        file_name = "bench_{0}.{1}".format(size["file_nodes"], extension)
+        return os.path.join(tempfile.gettempdir(), file_name).replace("\\", "/")
+
+
+def run_case(name, size_name, repeat=1, profiler=None):
+    import cmds_profiler
+
+    size = SIZES[size_name]
+    result = {"operation": name, "size": size_name, "params": size}
+    times = []
+
+    try:
+        for _ in range(repeat):
+            modules, operation = getattr(Benchmarks, "benchmark_" + name)(size)
+            case_profiler = cmds_profiler.CmdsProfiler()
+            with case_profiler.profile(modules, name):
+                start = timeit.default_timer()
+                operation()
+                times.append(timeit.default_timer() - start)
+    except Exception as e:
+        result["skipped"] = "{0}: {1}".format(type(e).__name__, e)
+        return result
+
+    summary = case_profiler.report().get(name, {"calls": 0, "commands": {}, "rows": []})
+    result["wall_time"] = min(times)
+    result["wall_time_mean"] = sum(times) / len(times)
+    result["cmds_calls"] = summary["calls"]
+    result["cmds_breakdown"] = summary["commands"]
+    result["cmds_profile"] = summary["rows"][:10]
+
+    if profiler:
+        for key, stats in case_profiler.stats.items():
+            profiler.stats[(size_name + ":" + key[0],) + key[1:]] = stats
+
+    if name.startswith("scene_save"):
+        result["file_bytes"] = os.path.getsize(Benchmarks.scene_file_path(size, name[-2:]))
+
+    return result
+
+
+def run_benchmarks(size_names=("small",), operations=None, repeat=1, output=None, folded=None):
+    """
+    folded: optional path for a flame graph (folded stacks) file of all the cmds calls
+    """
+    import maya.cmds as cmds
+
+    add_tool_paths()
+    import cmds_profiler
+
+    profiler = cmds_profiler.CmdsProfiler()
+
+    results = {
+        "meta": {
+            "commit": get_commit(),
+            "maya_version": cmds.about(version=True),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+        },
+        "results": [],
+    }
+
+    for size_name in size_names:
+        for name in operations or Benchmarks.names():
+            results["results"].append(run_case(name, size_name, repeat, profiler))
+
+    if output:
+        with open(output, "w") as f:
+            json.dump(results, f, indent=2, sort_keys=True)
+
+    if folded:
+        profiler.write_folded(folded)
+
+    print_results(results)
+    return results
+
+
+def print_results(results):
+    print("{0:<22}{1:<8}{2:>12}{3:>12}".format("operation", "size", "seconds", "cmds calls"))
+    for result in results["results"]:
+        if "skipped" in result:
+            print("{0:<22}{1:<8}  skipped ({2})".format(result["operation"], result["size"], result["skipped"]))
+        else:
+            print("{0:<22}{1:<8}{2:>12.4f}{3:>12}".format(result["operation"], result["size"], result["wall_time"], result["cmds_calls"]))
+
+
+def compare_results(baseline_path, current_path):
+    """
+    Print time ratio and cmds call delta for every case present in both files
+    """
+    with open(baseline_path) as f:
+        baseline = json.load(f)
+    with open(current_path) as f:
+        current = json.load(f)
+
+    baseline_cases = dict(((r["operation"], r["size"]), r) for r in baseline["results"] if "skipped" not in r)
+
+    rows = []
+    for result in current["results"]:
+        key = (result["operation"], result["size"])
+        if "skipped" in result or key not in baseline_cases:
+            continue
+
+        old = baseline_cases[key]
+        ratio = result["wall_time"] / old["wall_time"] if old["wall_time"] else float("inf")
+        rows.append((key[0], key[1], old["wall_time"], result["wall_time"], ratio, result["cmds_calls"] - old["cmds_calls"]))
+
+    print("{0} -> {1}".format(baseline["meta"]["commit"], current["meta"]["commit"]))
+    print("{0:<22}{1:<8}{2:>12}{3:>12}{4:>8}{5:>12}".format("operation", "size", "before", "after", "ratio", "calls +/-"))
+    for row in rows:
+        print("{0:<22}{1:<8}{2:>12.4f}{3:>12.4f}{4:>8.2f}{5:>+12}".format(*row))
+
+    return rows
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark the Maya tools")
+    subparsers = parser.add_subparsers(dest="command")
+
+    run_parser = subparsers.add_parser("run")
+    run_parser.add_argument("--sizes", default="small", help="comma separated: " + ", ".join(sorted(SIZES)))
+    run_parser.add_argument("--operations", default=None, help="comma separated subset of: " + ", ".join(Benchmarks.names()))
+    run_parser.add_argument("--repeat", type=int, default=1)
+    run_parser.add_argument("--output", default=None)
+    run_parser.add_argument("--folded", default=None, help="write a flame graph (folded stacks) file of the cmds calls")
+
+    compare_parser = subparsers.add_parser("compare")
+    compare_parser.add_argument("baseline")
+    compare_parser.add_argument("current")
+
+    args = parser.parse_args(argv)
+
+    if args.command == "compare":
+        compare_results(args.baseline, args.current)
+    elif args.command == "run":
+        import maya.standalone
+        maya.standalone.initialize()
+
+        # the dialog based tools need a QApplication, which mayapy does not create
+        from PySide2 import QtWidgets
+        if not QtWidgets.QApplication.instance():
+            app = QtWidgets.QApplication(sys.argv)
+
+        operations = args.operations.split(",") if args.operations else None
+        run_benchmarks(args.sizes.split(","), operations, args.repeat, args.output, args.folded)
+    else:
+        parser.print_help()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,212 @@
+"""
+Opt-in maya.cmds profiler for the tools.
+
+Swaps the "cmds" global of the tool modules for a proxy that counts and
+times every call, keyed by operation, calling function, command and the
+set of flags passed. Results can be printed as a sorted table or written in
+the folded stack format read by flamegraph.pl / speedscope.
+
+Usage:
+    import cmds_profiler
+    import tranform_obj
+
+    profiler = cmds_profiler.CmdsProfiler()
+    with profiler.profile([tranform_obj], "refresh_table"):
+        dialog.refresh_table()
+
+    profiler.print_table()
+    profiler.write_folded("C:/tmp/refresh_table.folded")
+
+Or for every loaded tool at once:
+    cmds_profiler.enable()
+    ...use the tools...
+    cmds_profiler.disable().print_table()
+"""
+
+import sys
+import timeit
+
+import maya.cmds as cmds
+
+
+TOOL_MODULES = ["anim_cache", "import_save", "key_reducer", "object_renamer", "retiming_tool", "tweener", "tranform_obj", "undo_journal", "wireframe_colors"]
+
+UNLABELLED = "<unlabelled>"
+
+
+class ProfiledCmds(object):
+    """
+    Stand-in for the maya.cmds module that reports every call to a CmdsProfiler
+    """
+
+    def __init__(self, cmds_module, profiler):
+        self._cmds = cmds_module
+        self._profiler = profiler
+        self._wrappers = {}
+
+    def __getattr__(self, name):
+        if name in self._wrappers:
+            return self._wrappers[name]
+
+        attr = getattr(self._cmds, name)
+        if not callable(attr):
+            return attr
+
+        profiler = self._profiler
+
+        def profiled(*args, **kwargs):
+            start = timeit.default_timer()
+            try:
+                return attr(*args, **kwargs)
+            finally:
+                profiler.add(sys._getframe(1).f_code.co_name, name, kwargs, timeit.default_timer() - start)
+
+        self._wrappers[name] = profiled
+        return profiled
+
+
+class CmdsProfiler(object):
+
+    def __init__(self):
+        self.stats = {}
+        # (operation, caller, command, flags) -> [calls, total seconds, slowest call]
+        self.operation_name = UNLABELLED
+        self.installed = {}
+
+    def add(self, caller, command, kwargs, seconds):
+        key = (self.operation_name, caller, command, ",".join(sorted(kwargs)))
+        entry = self.stats.get(key)
+        if entry:
+            entry[0] += 1
+            entry[1] += seconds
+            if seconds > entry[2]:
+                entry[2] = seconds
+        else:
+            self.stats[key] = [1, seconds, seconds]
+
+    def install(self, modules):
+        proxy = ProfiledCmds(cmds, self)
+        for module in modules:
+            if module not in self.installed:
+                self.installed[module] = module.cmds
+                module.cmds = proxy
+
+    def uninstall(self):
+        for module, original in self.installed.items():
+            module.cmds = original
+        self.installed = {}
+
+    def operation(self, name):
+        return OperationLabel(self, name)
+
+    def profile(self, modules, name):
+        """
+        Context manager installing the proxy on modules and labelling the calls made inside it
+        """
+        return ProfileBlock(self, modules, name)
+
+    def clear(self):
+        self.stats = {}
+
+    def report(self):
+        """
+        Per operation totals plus every (caller, command, flags) row, slowest first
+        """
+        operations = {}
+        for (operation, caller, command, flags), (calls, seconds, slowest) in self.stats.items():
+            summary = operations.setdefault(operation, {"calls": 0, "seconds": 0.0, "commands": {}, "rows": []})
+            summary["calls"] += calls
+            summary["seconds"] += seconds
+            summary["commands"][command] = summary["commands"].get(command, 0) + calls
+            summary["rows"].append({"caller": caller, "command": command, "flags": flags, "calls": calls, "seconds": seconds, "slowest": slowest})
+
+        for summary in operations.values():
+            summary["rows"].sort(key=lambda row: row["seconds"], reverse=True)
+
+        return operations
+
+    def print_table(self, limit=20):
+        for operation, summary in sorted(self.report().items(), key=lambda item: item[1]["seconds"], reverse=True):
+            print("{0}: {1} calls, {2:.4f}s".format(operation, summary["calls"], summary["seconds"]))
+            print("    {0:<24}{1:<16}{2:<40}{3:>8}{4:>12}{5:>12}".format("caller", "command", "flags", "calls", "total ms", "mean us"))
+            for row in summary["rows"][:limit]:
+                print("    {0:<24}{1:<16}{2:<40}{3:>8}{4:>12.3f}{5:>12.1f}".format(
+                    row["caller"], row["command"], row["flags"] or "-", row["calls"], row["seconds"] * 1000.0, row["seconds"] * 1000000.0 / row["calls"]))
+
+    def folded_lines(self):
+        """
+        "operation;caller;command(flags) microseconds" lines for flame graph tools
+        """
+        lines = []
+        for (operation, caller, command, flags), (calls, seconds, slowest) in sorted(self.stats.items()):
+            lines.append("{0};{1};{2}({3}) {4}".format(operation, caller, command, flags, int(round(seconds * 1000000.0))))
+        return lines
+
+    def write_folded(self, file_path):
+        with open(file_path, "w") as f:
+            f.write("\n".join(self.folded_lines()) + "\n")
+
+
+class OperationLabel(object):
+
+    def __init__(self, profiler, name):
+        self.profiler = profiler
+        self.name = name
+
+    def __enter__(self):
+        self.previous_name = self.profiler.operation_name
+        self.profiler.operation_name = self.name
+        return self.profiler
+
+    def __exit__(self, *args):
+        self.profiler.operation_name = self.previous_name
+        return False
+
+
+class ProfileBlock(OperationLabel):
+
+    def __init__(self, profiler, modules, name):
+        super(ProfileBlock, self).__init__(profiler, name)
+        self.modules = modules
+
+    def __enter__(self):
+        self.previous_installed = dict(self.profiler.installed)
+        self.profiler.install(self.modules)
+        return super(ProfileBlock, self).__enter__()
+
+    def __exit__(self, *args):
+        super(ProfileBlock, self).__exit__(*args)
+        for module in self.modules:
+            if module not in self.previous_installed:
+                module.cmds = self.profiler.installed.pop(module)
+        return False
+
+
+active_profiler = None
+
+
+def enable(module_names=TOOL_MODULES):
+    """
+    Profile every tool module that is already imported until disable() is called
+    """
+    global active_profiler
+
+    if not active_profiler:
+        active_profiler = CmdsProfiler()
+    active_profiler.install([sys.modules[name] for name in module_names if name in sys.modules])
+
+    return active_profiler
+
+
+def disable():
+    """
+    Restore the real cmds module and return the profiler holding the results
+    """
+    global active_profiler
+
+    profiler = active_profiler
+    if profiler:
+        profiler.uninstall()
+    active_profiler = None
+
+    return profiler
@@ -1,25 +1,147 @@
 from PySide2 import QtCore
 from PySide2 import QtGui
 from PySide2 import QtWidgets
-from shiboken2 import wrapInstance
+
+import functools
+import glob
+import hashlib
+import os
+import shutil
+import sys
 
 import maya.OpenMaya as om
-import maya.OpenMayaUI as omui
 import maya.cmds as cmds
 
 
 def maya_main_window():
     """
-    Return the Maya main window widget as a Python object
+    Return the Maya main window widget as a Python object (None in mayapy)
     """
+    import maya.OpenMayaUI as omui
+    from shiboken2 import wrapInstance
+
     main_window_ptr = omui.MQtUtil.mainWindow()
+    if main_window_ptr is None:
+        return None
     return wrapInstance(long(main_window_ptr), QtWidgets.QWidget)
 
 
+class ScenePreviewCache(object):
+    """
+    Preview images on disk, keyed by a hash of the scene's path, size and
+    modification time so a changed file gets new previews
+    """
+
+    SCENE_EXTENSIONS = (".ma", ".mb")
+    STAGING_SUFFIX = "_staging"
+    # preview_worker renders into <prefix>_staging before moving the images into place
+
+    def __init__(self, directory=None):
+        self.directory = directory or os.path.join(cmds.internalVar(userAppDir=True), "scene_previews")
+        if not os.path.isdir(self.directory):
+            os.makedirs(self.directory)
+
+        for staging_dir in glob.glob(os.path.join(self.directory, "*" + self.STAGING_SUFFIX)):
+            shutil.rmtree(staging_dir, ignore_errors=True)
+            # left behind by workers that were killed or crashed
+
+    def get_prefix(self, scene_path):
+        stat = os.stat(scene_path)
+        key = "{0}|{1}|{2}".format(os.path.normcase(os.path.abspath(scene_path)), stat.st_size, stat.st_mtime)
+        return os.path.join(self.directory, hashlib.sha1(key.encode("utf-8")).hexdigest())
+
+    def get_staging_dir(self, scene_path):
+        return self.get_prefix(scene_path) + self.STAGING_SUFFIX
+
+    def get_images(self, scene_path):
+        return sorted(glob.glob(self.get_prefix(scene_path) + "_*.png"))
+
+    @classmethod
+    def list_scenes(cls, directory):
+        return sorted(os.path.join(directory, name) for name in os.listdir(directory) if name.lower().endswith(cls.SCENE_EXTENSIONS))
+
+
+class PreviewWorkerPool(QtCore.QObject):
+    """
+    Renders scene previews in background mayapy processes, at most
+    max_workers at a time. QProcess reports back through the event loop so
+    the UI never waits on a worker.
+    """
+
+    preview_ready = QtCore.Signal(str, list)
+    # scene path, preview image paths (empty if the render failed)
+
+    WORKER_SCRIPT = os.path.join(os.path.dirname(os.path.abspath(__file__)), "preview_worker.py")
+
+    def __init__(self, cache, max_workers=2, frame_count=8, size=160, parent=None):
+        super(PreviewWorkerPool, self).__init__(parent)
+
+        self.cache = cache
+        self.max_workers = max_workers
+        self.frame_count = frame_count
+        self.size = size
+
+        self.queue = []
+        self.running = {}
+        # scene path -> QProcess
+
+    @classmethod
+    def get_mayapy(cls):
+        executable = "mayapy.exe" if sys.platform.startswith("win") else "mayapy"
+        return os.path.join(os.environ.get("MAYA_LOCATION", ""), "bin", executable)
+
+    def request(self, scene_path):
+        images = self.cache.get_images(scene_path)
+        if images:
+            self.preview_ready.emit(scene_path, images)
+        elif scene_path not in self.queue and scene_path not in self.running:
+            self.queue.append(scene_path)
+            self.start_next()
+
+    def start_next(self):
+        while self.queue and len(self.running) < self.max_workers:
+            scene_path = self.queue.pop(0)
+
+            process = QtCore.QProcess(self)
+            process.finished.connect(functools.partial(self.on_finished, scene_path))
+            process.errorOccurred.connect(functools.partial(self.on_finished, scene_path))
+            # a worker that fails to start never reports finished
+            self.running[scene_path] = process
+            process.start(self.get_mayapy(), [self.WORKER_SCRIPT, scene_path, self.cache.get_prefix(scene_path), str(self.frame_count), str(self.size)])
+
+    def on_finished(self, scene_path, *args):
+        process = self.running.pop(scene_path, None)
+        if not process:
+            return
+        process.deleteLater()
+
+        self.preview_ready.emit(scene_path, self.cache.get_images(scene_path))
+        self.start_next()
+
+    def cancel(self):
+        self.queue = []
+        for scene_path, process in self.running.items():
+            process.finished.disconnect()
+            process.errorOccurred.disconnect()
+            process.kill()
+            process.waitForFinished(1000)
+            process.deleteLater()
+            try:
+                shutil.rmtree(self.cache.get_staging_dir(scene_path), ignore_errors=True)
+            except OSError:
+                pass
+                # the scene file is gone, the next cache startup sweeps the folder
+            # a killed worker never gets to clean up its own staging folder
+        self.running = {}
+
+
 class OpenImportDialog(QtWidgets.QDialog):
 
     FILE_FILTERS = "Maya (*.ma *.mb);;Maya ASCII (*.ma);;Maya Binary (*.mb);;All Files (*.*)"
 
+    PREVIEW_ROLE = QtCore.Qt.UserRole
+    # preview image paths of a list item
+
     selected_filter = "Maya (*ma *.mb)"
 
     dlg_instance = None
@@ -35,7 +157,9 @@ class OpenImportDialog(QtWidgets.QDialog):
             cls.dlg_instance.raise_()
             cls.dlg_instance.activateWindow()
 
-    def __init__(self, parent=maya_main_window()):
+    def __init__(self, parent=None):
+        if parent is None:
+            parent = maya_main_window()
         super(OpenImportDialog, self).__init__(parent)
 
         self.setWindowTitle("Open/Import/Reference")
@@ -47,10 +171,24 @@ class OpenImportDialog(QtWidgets.QDialog):
         elif cmds.about(macOS=True):
             self.setWindowFlags(QtCore.Qt.Tool)
 
+        # widgets are built on first show, see showEvent
+        self.ui_built = False
 
-        self.create_widgets()
-        self.create_layout()
-        self.create_connections()
+        self.preview_pool = None
+        self.preview_items = {}
+        # scene path -> list item
+        self.preview_frame = 0
+        self.preview_dir = None
+        # folder the list was last filled from
+
+    def showEvent(self, e):
+        if not self.ui_built:
+            self.create_widgets()
+            self.create_layout()
+            self.create_connections()
+            self.ui_built = True
+
+        super(OpenImportDialog, self).showEvent(e)
 
     def create_widgets(self):
         self.file_path_label = QtWidgets.QLabel("Open/Import/Reference File")
@@ -83,6 +221,21 @@ class OpenImportDialog(QtWidgets.QDialog):
 
         self.save_le = QtWidgets.QLineEdit()
 
+        self.preview_dir_le = QtWidgets.QLineEdit()
+        self.preview_dir_btn = QtWidgets.QPushButton()
+        self.preview_dir_btn.setIcon(QtGui.QIcon(":fileOpen.png"))
+        self.preview_dir_btn.setToolTip("Select Folder")
+
+        self.preview_list = QtWidgets.QListWidget()
+        self.preview_list.setViewMode(QtWidgets.QListView.IconMode)
+        self.preview_list.setIconSize(QtCore.QSize(96, 96))
+        self.preview_list.setResizeMode(QtWidgets.QListView.Adjust)
+        self.preview_list.setMinimumHeight(140)
+
+        self.preview_timer = QtCore.QTimer(self)
+        self.preview_timer.setInterval(250)
+        # flips through the frames of the selected preview
+
 
     def create_layout(self):
         label1 = QtWidgets.QHBoxLayout()
@@ -124,8 +277,14 @@ class OpenImportDialog(QtWidgets.QDialog):
         save_btn_layout.addStretch()
         save_btn_layout.addWidget(self.save_btn)
 
+        preview_dir_layout = QtWidgets.QHBoxLayout()
+        preview_dir_layout.addWidget(self.preview_dir_le)
+        preview_dir_layout.addWidget(self.preview_dir_btn)
+
         form_layout = QtWidgets.QFormLayout()
         form_layout.addRow("", label1)
+        form_layout.addRow("Folder:", preview_dir_layout)
+        form_layout.addRow(self.preview_list)
         form_layout.addRow("File:", file_path_layout)
         form_layout.addRow("", radio_btn_layout)
         form_layout.addRow("", self.force_cb)
@@ -148,6 +307,80 @@ class OpenImportDialog(QtWidgets.QDialog):
 
         self.apply_btn.clicked.connect(self.load_file)
 
+        self.preview_dir_btn.clicked.connect(self.show_preview_dir_dialog)
+        self.preview_dir_le.editingFinished.connect(self.on_preview_dir_edited)
+        self.preview_list.currentItemChanged.connect(self.on_preview_selected)
+        self.preview_timer.timeout.connect(self.show_next_preview_frame)
+
+    def hideEvent(self, e):
+        if self.preview_pool:
+            self.preview_pool.cancel()
+        self.preview_timer.stop()
+
+        super(OpenImportDialog, self).hideEvent(e)
+
+    def show_preview_dir_dialog(self):
+        directory = QtWidgets.QFileDialog.getExistingDirectory(self, "Select Folder", self.preview_dir_le.text())
+        if directory:
+            self.preview_dir_le.setText(directory)
+            self.update_previews()
+
+    def on_preview_dir_edited(self):
+        if self.preview_dir_le.text() != self.preview_dir:
+            self.update_previews()
+        # editingFinished also fires when the field just loses focus
+
+    def update_previews(self):
+        """
+        List the folder's scene files and request their previews, the icons
+        fill in as the workers finish
+        """
+        directory = self.preview_dir_le.text()
+        if not os.path.isdir(directory):
+            return
+        self.preview_dir = directory
+
+        if not self.preview_pool:
+            self.preview_pool = PreviewWorkerPool(ScenePreviewCache(), parent=self)
+            self.preview_pool.preview_ready.connect(self.on_preview_ready)
+        self.preview_pool.cancel()
+
+        self.preview_list.clear()
+        self.preview_items = {}
+        for scene_path in ScenePreviewCache.list_scenes(directory):
+            item = QtWidgets.QListWidgetItem(QtGui.QIcon(":fileOpen.png"), os.path.basename(scene_path))
+            item.setToolTip(scene_path)
+            item.setData(self.PREVIEW_ROLE, [])
+            self.preview_list.addItem(item)
+            self.preview_items[scene_path] = item
+
+        for scene_path in self.preview_items:
+            self.preview_pool.request(scene_path)
+
+    def on_preview_ready(self, scene_path, images):
+        item = self.preview_items.get(scene_path)
+        if item and images:
+            item.setData(self.PREVIEW_ROLE, images)
+            item.setIcon(QtGui.QIcon(images[0]))
+
+    def on_preview_selected(self, item, previous):
+        if previous and previous.data(self.PREVIEW_ROLE):
+            previous.setIcon(QtGui.QIcon(previous.data(self.PREVIEW_ROLE)[0]))
+
+        self.preview_frame = 0
+        if item:
+            self.filepath_le.setText(item.toolTip())
+            self.preview_timer.start()
+        else:
+            self.preview_timer.stop()
+
+    def show_next_preview_frame(self):
+        item = self.preview_list.currentItem()
+        images = item.data(self.PREVIEW_ROLE) if item else None
+        if images and len(images) > 1:
+            self.preview_frame = (self.preview_frame + 1) % len(images)
+            item.setIcon(QtGui.QIcon(images[self.preview_frame]))
+
     def show_file_select_dialog(self):
         file_path, self.selected_filter = QtWidgets.QFileDialog.getOpenFileName(self, "Select File", "", self.FILE_FILTERS, self.selected_filter)
         if file_path:
@@ -0,0 +1,103 @@
+"""
+Renders preview frames of a scene file, run by mayapy from import_save's PreviewWorkerPool:
+
+    mayapy preview_worker.py <scene file> <output prefix> <frame count> <size>
+
+Writes <output prefix>_0000.png, <output prefix>_0001.png... spread evenly over
+the scene's playback range. The images are rendered into <output prefix>_staging
+and moved into place only once all of them are done, so a preview is either
+complete or missing. The pool and the cache remove staging folders of killed workers.
+
+Viewport 2.0 renders need a graphics context, which mayapy does not always get
+without a display, so frames fall back to the Maya Software renderer.
+"""
+
+import os
+import shutil
+import sys
+
+STAGING_SUFFIX = "_staging"
+# must match ScenePreviewCache.STAGING_SUFFIX
+
+
+class FrameRenderer(object):
+    """
+    Renders the current frame with ogsRender, or with Maya Software once
+    ogsRender has failed, which it does for the rest of the session
+    """
+
+    def __init__(self, camera, size):
+        self.camera = camera
+        self.size = size
+        self.software = False
+
+    def render(self):
+        import maya.cmds as cmds
+
+        if not self.software:
+            try:
+                image_path = cmds.ogsRender(camera=self.camera, width=self.size, height=self.size, currentFrame=True)
+            except RuntimeError:
+                image_path = None
+            if image_path and os.path.isfile(image_path):
+                return image_path
+
+            self.software = True
+            cmds.setAttr("defaultRenderGlobals.currentRenderer", "mayaSoftware", type="string")
+            cmds.setAttr("defaultResolution.width", self.size)
+            cmds.setAttr("defaultResolution.height", self.size)
+            cmds.setAttr("defaultResolution.deviceAspectRatio", 1.0)
+            # no Viewport 2.0 context, e.g. mayapy on a machine without a display
+
+        return cmds.render(self.camera, x=self.size, y=self.size)
+
+
+def render_previews(scene_path, output_prefix, frame_count, size):
+    import maya.cmds as cmds
+
+    cmds.file(scene_path, open=True, force=True, ignoreVersion=True, prompt=False)
+    cmds.setAttr("defaultRenderGlobals.imageFormat", 32)
+    # png
+
+    start = cmds.playbackOptions(query=True, minTime=True)
+    end = cmds.playbackOptions(query=True, maxTime=True)
+    if frame_count > 1:
+        times = [start + (end - start) * i / float(frame_count - 1) for i in range(frame_count)]
+    else:
+        times = [start]
+
+    cmds.viewFit("persp", all=True)
+
+    staging_dir = output_prefix + STAGING_SUFFIX
+    # next to the cache so the final moves are renames
+    shutil.rmtree(staging_dir, ignore_errors=True)
+    os.makedirs(staging_dir)
+    # a previous worker for the same scene may have been killed halfway
+    try:
+        renderer = FrameRenderer("persp", size)
+        rendered = []
+        for i, time in enumerate(times):
+            cmds.currentTime(time)
+            image_path = os.path.join(staging_dir, "{0:04d}.png".format(i))
+            shutil.move(renderer.render(), image_path)
+            rendered.append(image_path)
+            # both renderers reuse one file name when the render globals are not set to animation
+
+        for i, image_path in enumerate(rendered):
+            shutil.move(image_path, "{0}_{1:04d}.png".format(output_prefix, i))
+    finally:
+        shutil.rmtree(staging_dir, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    import maya.standalone
+    maya.standalone.initialize()
+
+    try:
+        render_previews(sys.argv[1], sys.argv[2], int(sys.argv[3]), int(sys.argv[4]))
+    except Exception as e:
+        sys.stderr.write("Preview failed for {0}: {1}\n".format(sys.argv[1], e))
+        os._exit(1)
+
+    os._exit(0)
+    # skips the slow standalone shutdown
@@ -0,0 +1,188 @@
+import array
+import os
+import sys
+import time
+
+import maya.cmds as cmds
+import maya.mel as mel
+import maya.OpenMaya as om
+import maya.api.OpenMaya as om2
+
+SHARED_DIRS = ["Undo_Journal"]
+# folders of the shared modules, next to this tool's folder. The shelf launcher
+# adds them itself, this covers running the file on its own
+if "__file__" in globals():
+    for shared_dir in SHARED_DIRS:
+        shared_path = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), shared_dir)
+        if shared_path not in sys.path:
+            sys.path.append(shared_path)
+    # code pasted into the script editor has no __file__, see the README
+
+import undo_journal
+
+
+class KeyReducer(object):
+    '''
+    Removes redundant keys from animation curves (e.g. a key on every frame
+    of mocap) with the Ramer-Douglas-Peucker algorithm: a key is only kept
+    if dropping it would move the curve by more than the tolerance
+    '''
+
+    BATCH_SIZE = 1000
+    # number of curves per mel.eval call
+
+    @classmethod
+    def simplify(cls, times, values, tolerance):
+        '''
+        Return the indices of the keys to keep. The error of a dropped key is
+        its value distance from the straight line between the kept keys around
+        it, which is the curve once the kept keys have linear tangents.
+        '''
+        count = len(times)
+        if count < 3:
+            return list(range(count))
+
+        keep = bytearray(count)
+        keep[0] = keep[-1] = 1
+        segments = [(0, count - 1)]
+
+        while segments:
+            first, last = segments.pop()
+            if last - first < 2:
+                continue
+
+            start_time, start_value = times[first], values[first]
+            slope = (values[last] - start_value) / (times[last] - start_time)
+
+            worst_error = -1.0
+            worst = first
+            for i in range(first + 1, last):
+                error = abs(values[i] - start_value - (times[i] - start_time) * slope)
+                if error > worst_error:
+                    worst_error, worst = error, i
+
+            if worst_error > tolerance:
+                keep[worst] = 1
+                segments.append((first, worst))
+                segments.append((worst, last))
+
+        return [i for i in range(count) if keep[i]]
+
+    @classmethod
+    def get_keys(cls, curves):
+        '''
+        {curve: (times, values)} from one time and one value query over all
+        curves, split with the key counts read through the API
+        '''
+        selection_list = om2.MSelectionList()
+        for curve in curves:
+            selection_list.add(curve)
+        counts = [om2.MFnAnimCurve(selection_list.getDependNode(i)).numKeys for i in range(len(curves))]
+
+        times = cmds.keyframe(curves, query=True, timeChange=True) or []
+        values = cmds.keyframe(curves, query=True, valueChange=True) or []
+        # one flat list each, curve after curve in the order given
+
+        keys = {}
+        offset = 0
+        for curve, count in zip(curves, counts):
+            keys[curve] = (array.array("d", times[offset:offset + count]), array.array("d", values[offset:offset + count]))
+            offset += count
+
+        return keys
+
+    @classmethod
+    def reduce_curves(cls, curves, tolerance):
+        '''
+        Simplify every curve and remove the dropped keys in one batched pass.
+        The remaining keys of a reduced curve get linear tangents, so the curve
+        is the straight lines simplify() measured against and stays within
+        tolerance of every original key.
+        Returns {curve: {"before": keys, "after": keys, "seconds": time spent}}
+        '''
+        report = {}
+        commands = []
+
+        start = time.time()
+        curves = sorted(set(curves))
+        keys = cls.get_keys(curves) if curves else {}
+        query_seconds = (time.time() - start) / len(curves) if curves else 0.0
+        # the bulk query is shared evenly between the curves
+
+        for curve in curves:
+            start = time.time()
+            times, values = keys[curve]
+
+            kept = set(cls.simplify(times, values, tolerance))
+            dropped = [i for i in range(len(times)) if i not in kept]
+            if dropped:
+                commands.append("cutKey -clear {0} {1};keyTangent -inTangentType linear -outTangentType linear {1};".format(
+                    " ".join("-index {0}".format(i) for i in dropped), curve))
+
+            report[curve] = {"before": len(times), "after": len(kept), "seconds": time.time() - start + query_seconds}
+
+        start = time.time()
+        for i in range(0, len(commands), cls.BATCH_SIZE):
+            mel.eval("".join(commands[i:i + cls.BATCH_SIZE]))
+
+        if commands:
+            cut_seconds = (time.time() - start) / len(commands)
+            for curve in report:
+                if report[curve]["before"] != report[curve]["after"]:
+                    report[curve]["seconds"] += cut_seconds
+                    # the batched cut is shared evenly between the curves it touched
+
+        return report
+
+    @classmethod
+    def reduce_selection(cls, tolerance):
+        curves = cmds.keyframe(query=True, name=True) or []
+
+        if not curves:
+            om.MGlobal.displayError("No animation curves on the selection")
+            return None
+
+        with undo_journal.Transaction("reduceKeys"):
+            report = cls.reduce_curves(curves, tolerance)
+
+        cls.print_report(report)
+        return report
+
+    @classmethod
+    def print_report(cls, report):
+        print("{0:<40}{1:>8}{2:>8}{3:>8}{4:>10}".format("curve", "before", "after", "kept", "ms"))
+        for curve, row in sorted(report.items()):
+            kept = 100.0 * row["after"] / row["before"] if row["before"] else 100.0
+            print("{0:<40}{1:>8}{2:>8}{3:>7.1f}%{4:>10.2f}".format(curve, row["before"], row["after"], kept, row["seconds"] * 1000.0))
+
+        before = sum(row["before"] for row in report.values())
+        after = sum(row["after"] for row in report.values())
+        om.MGlobal.displayInfo("Reduced {0} curves from {1} to {2} keys".format(len(report), before, after))
+
+
+class KeyReducerWindow(object):
+    '''
+    This class is responsible for the interface of the tool.
+    '''
+
+    windowName = "KeyReducerWindow"
+
+    def show(self):
+        if cmds.window(self.windowName, query=True, exists=True):
+            cmds.deleteUI(self.windowName)
+
+        cmds.window(self.windowName, title="Key Reducer", widthHeight=(250, 80))
+
+        cmds.columnLayout(adjustableColumn=True)
+        self.tolerance_field = cmds.floatFieldGrp(label="Tolerance:", value1=0.01, precision=4, columnWidth2=(70, 120))
+        cmds.button(label="Reduce Selected Curves", command=self.reduce)
+
+        cmds.showWindow()
+
+    def reduce(self, *args):
+        tolerance = cmds.floatFieldGrp(self.tolerance_field, query=True, value1=True)
+        KeyReducer.reduce_selection(tolerance)
+
+
+if __name__ == "__main__":
+    KeyReducerWindow().show()
@@ -1,24 +1,456 @@
 from PySide2 import QtCore
 from PySide2 import QtWidgets
-from shiboken2 import wrapInstance
+
+import json
+import os
+import sys
 
 import maya.cmds as cmds
-import maya.OpenMayaUI as omui
+import maya.OpenMaya as om
+
+SHARED_DIRS = ["Undo_Journal"]
+# folders of the shared modules, next to this tool's folder. The shelf launcher
+# adds them itself, this covers running the file on its own
+if "__file__" in globals():
+    for shared_dir in SHARED_DIRS:
+        shared_path = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), shared_dir)
+        if shared_path not in sys.path:
+            sys.path.append(shared_path)
+    # code pasted into the script editor has no __file__, see the README
+
+import undo_journal
 
 
 def maya_main_window():
     """
-    Return the Maya main window widget as a Python object
+    Return the Maya main window widget as a Python object (None in mayapy)
     """
+    import maya.OpenMayaUI as omui
+    from shiboken2 import wrapInstance
+
     main_window_ptr = omui.MQtUtil.mainWindow()
+    if main_window_ptr is None:
+        return None
     return wrapInstance(long(main_window_ptr), QtWidgets.QWidget)
 
 
+class RenameEngine(object):
+    """
+    Applies one rename rule to many nodes. Names are parsed once into DAG path,
+    namespace and base name, the rule only ever sees the base name. Referenced
+    and locked nodes are filtered out up front with bulk queries instead of
+    failing one rename at a time; referenced nodes can instead be redirected
+    to a single edit of their namespace.
+
+    Rules are tuples:
+        ("rename", new_name)
+        ("replace", find, replace)
+        ("prefix", prefix)
+        ("suffix", suffix)
+        ("set_suffix", suffix, [known suffixes])    replaces any known suffix
+        ("unique", [known suffixes])                adds the parent's name before the suffix
+
+    Every rename is kept in history as a RenameRecord.
+    """
+
+    MAX_HISTORY = 50
+
+    history = []
+
+    @classmethod
+    def apply_rule(cls, rule, name, parent=""):
+        kind = rule[0]
+        if kind == "rename":
+            return rule[1]
+        if kind == "replace":
+            return name.replace(rule[1], rule[2]) or name
+        if kind == "prefix":
+            return rule[1] + name
+        if kind == "suffix":
+            return name + rule[1]
+        if kind == "set_suffix":
+            return cls.split_suffix(name, rule[2])[0] + rule[1]
+        if kind == "unique":
+            base_name, suffix = cls.split_suffix(name, rule[1])
+            parent_name = parent.rpartition("|")[2].rpartition(":")[2]
+            return "{0}_{1}{2}".format(base_name, cls.split_suffix(parent_name, rule[1])[0], suffix) if parent_name else name
+
+        raise ValueError("Unknown rename rule: {0}".format(kind))
+
+    @classmethod
+    def split_suffix(cls, name, suffixes):
+        """
+        "arm_geo", ["_geo", "_grp"] -> ("arm", "_geo")
+        """
+        for suffix in sorted(suffixes, key=len, reverse=True):
+            if suffix and name.endswith(suffix) and len(name) > len(suffix):
+                return name[:-len(suffix)], suffix
+        return name, ""
+
+    @classmethod
+    def parse(cls, node):
+        """
+        "|grp|ns:sub:name" -> ("|grp", "ns:sub", "name")
+        """
+        parent, _, short_name = node.rpartition("|")
+        namespace, _, base_name = short_name.rpartition(":")
+        return parent, namespace, base_name
+
+    @classmethod
+    def get_protected(cls, nodes):
+        """
+        Returns (referenced nodes, locked nodes), two bulk queries
+        """
+        referenced = set(cmds.ls(nodes, readOnly=True, long=True) or [])
+        locked = set(node for node, is_locked in zip(nodes, cmds.lockNode(nodes, query=True, lock=True) or []) if is_locked)
+        return referenced, locked - referenced
+
+    @classmethod
+    def get_reference_files(cls):
+        """
+        {namespace: reference file} for every loaded reference
+        """
+        reference_files = {}
+        for reference_file in cmds.file(query=True, reference=True) or []:
+            reference_files[cmds.file(reference_file, query=True, namespace=True)] = reference_file
+        return reference_files
+
+    @classmethod
+    def rename_namespace(cls, transaction, old_namespace, new_namespace, reference_files=None):
+        """
+        One edit renames every node in the namespace. Namespaces of references
+        are changed on the reference itself. Goes through the transaction so
+        it is journaled along with the node renames.
+        """
+        if reference_files is None:
+            reference_files = cls.get_reference_files()
+
+        transaction.rename_namespace(old_namespace, new_namespace, reference_files.get(old_namespace))
+
+        return new_namespace
+
+    @classmethod
+    def rename(cls, nodes, rule, name="rename", redirect_references=False):
+        """
+        Returns {"renamed": count, "skipped": [nodes], "namespaces": [(old, new)], "record": RenameRecord}
+        """
+        nodes = list(nodes)
+        report = {"renamed": 0, "skipped": [], "namespaces": [], "record": None}
+        if not nodes:
+            return report
+
+        referenced, locked = cls.get_protected(nodes)
+        report["skipped"] = sorted(locked)
+
+        namespaces = {}
+        renames = []
+        for node in nodes:
+            parent, namespace, base_name = cls.parse(node)
+            if node in referenced:
+                if redirect_references and namespace:
+                    namespaces[namespace] = cls.apply_rule(rule, namespace)
+                else:
+                    report["skipped"].append(node)
+            elif node not in locked:
+                new_name = cls.apply_rule(rule, base_name, parent)
+                if new_name != base_name:
+                    renames.append((node, namespace + ":" + new_name if namespace else new_name))
+
+        renames.sort(key=lambda rename: rename[0].count("|"), reverse=True)
+        # children first, so the paths of the nodes still to rename stay valid
+
+        record = RenameRecord(name, rule, redirect_references)
+        renamed_nodes = [node for node, new_name in renames]
+        uuids = dict(zip(cmds.ls(renamed_nodes, long=True), cmds.ls(renamed_nodes, uuid=True))) if renames else {}
+        # same arguments, same order: one query for all UUIDs
+
+        with undo_journal.Transaction(name, batch_size=len(renames)) as transaction:
+            for node, new_name in renames:
+                actual_name = transaction.rename(node, new_name)
+                record.renames.append([uuids.get(node), node.rpartition("|")[2], actual_name])
+            report["renamed"] = len(renames)
+
+            if namespaces:
+                reference_files = cls.get_reference_files()
+                for old_namespace, new_namespace in sorted(namespaces.items(), key=lambda item: item[0].count(":"), reverse=True):
+                    if new_namespace != old_namespace:
+                        cls.rename_namespace(transaction, old_namespace, new_namespace, reference_files)
+                        report["namespaces"].append((old_namespace, new_namespace))
+
+        record.namespaces = report["namespaces"]
+        record.transaction = transaction
+        if record.renames or record.namespaces:
+            cls.history.append(record)
+            del cls.history[:-cls.MAX_HISTORY]
+            report["record"] = record
+
+        return report
+
+    @classmethod
+    def print_report(cls, report):
+        message = "Renamed {0} nodes".format(report["renamed"])
+        if report["namespaces"]:
+            message += " and {0} namespaces".format(len(report["namespaces"]))
+        if report["skipped"]:
+            message += ", skipped {0} referenced or locked nodes".format(len(report["skipped"]))
+            om.MGlobal.displayWarning(message)
+        else:
+            om.MGlobal.displayInfo(message)
+
+
+class NamingValidator(object):
+    """
+    Checks every DAG transform of the scene against the naming convention in
+    one sweep: a suffix per node type (decided by the transform's shape) and
+    unique short names. Names are indexed once (short name -> nodes, type ->
+    nodes), the fixes go through RenameEngine grouped by rule.
+    """
+
+    DEFAULT_SUFFIXES = {"mesh": "_geo", "nurbsCurve": "_ctrl", "joint": "_jnt", "locator": "_loc", "group": "_grp"}
+    # node types without an entry (cameras, lights...) are not checked
+
+    def __init__(self, suffixes=None, unique_names=True):
+        self.suffixes = suffixes or dict(self.DEFAULT_SUFFIXES)
+        self.unique_names = unique_names
+        self.by_short_name = {}
+        self.by_type = {}
+        self.referenced = set()
+
+    def build_index(self):
+        listing = cmds.ls(dag=True, long=True, showType=True, noIntermediate=True) or []
+        nodes, types = listing[0::2], listing[1::2]
+        # one query, node and type alternate
+
+        kinds = {}
+        for node, node_type in zip(nodes, types):
+            if node_type == "transform":
+                kinds.setdefault(node, "group")
+            elif node_type == "joint":
+                kinds[node] = "joint"
+            else:
+                parent = node.rpartition("|")[0]
+                if kinds.get(parent) == "group":
+                    kinds[parent] = node_type
+                    # the first shape decides what the transform is
+
+        self.by_short_name = {}
+        self.by_type = {}
+        for node, kind in kinds.items():
+            self.by_short_name.setdefault(node.rpartition("|")[2], []).append(node)
+            self.by_type.setdefault(kind, []).append(node)
+
+        self.referenced = set(cmds.ls(dag=True, long=True, readOnly=True) or [])
+
+    def validate(self):
+        """
+        Returns [{"node", "problem", "rule"}], rule is None when the node cannot be renamed
+        """
+        self.build_index()
+        known_suffixes = sorted(set(self.suffixes.values()))
+
+        issues = []
+        for kind, suffix in self.suffixes.items():
+            for node in self.by_type.get(kind, []):
+                if not node.endswith(suffix):
+                    issues.append({"node": node, "problem": "{0} without {1}".format(kind, suffix),
+                                   "rule": ("set_suffix", suffix, known_suffixes)})
+
+        if self.unique_names:
+            for short_name, nodes in self.by_short_name.items():
+                if len(nodes) > 1:
+                    for node in nodes:
+                        issues.append({"node": node, "problem": "duplicate name {0}".format(short_name), "rule": ("unique", known_suffixes)})
+
+        for issue in issues:
+            if issue["node"] in self.referenced:
+                issue["rule"] = None
+
+        return issues
+
+    def fix(self, issues):
+        """
+        One RenameEngine pass per rule, suffix fixes before name clashes.
+        Nodes are tracked by UUID since earlier passes change their paths.
+        """
+        issues = [issue for issue in issues if issue["rule"]]
+        nodes = sorted(set(issue["node"] for issue in issues))
+        uuids = dict(zip(cmds.ls(nodes, long=True), cmds.ls(nodes, uuid=True))) if nodes else {}
+
+        by_rule = {}
+        for issue in issues:
+            rule = tuple(tuple(arg) if isinstance(arg, list) else arg for arg in issue["rule"])
+            by_rule.setdefault(rule, []).append(uuids.get(issue["node"]))
+
+        reports = []
+        for rule in sorted(by_rule, key=lambda rule: rule[0] == "unique"):
+            rule_uuids = [uuid for uuid in by_rule[rule] if uuid]
+            rule_nodes = (cmds.ls(rule_uuids, long=True) or []) if rule_uuids else []
+            reports.append(RenameEngine.rename(rule_nodes, rule, "naming_fix"))
+
+        return reports
+
+    @classmethod
+    def print_issues(cls, issues, limit=50):
+        for issue in issues[:limit]:
+            print("{0:<60}{1}{2}".format(issue["node"], issue["problem"], "" if issue["rule"] else " (referenced)"))
+        if len(issues) > limit:
+            print("... {0} more".format(len(issues) - limit))
+
+        om.MGlobal.displayInfo("{0} naming issues, {1} can be fixed".format(len(issues), len([issue for issue in issues if issue["rule"]])))
+
+
+class RenameRecord(object):
+    """
+    One batch rename: the rule that was applied and what it did, as
+    [uuid, old name, new name] rows plus the (old, new) namespaces renamed.
+    Serialises to plain JSON so it can be replayed on other scenes.
+    """
+
+    def __init__(self, name, rule, redirect_references=False, renames=None, namespaces=None):
+        self.name = name
+        self.rule = tuple(rule)
+        self.redirect_references = redirect_references
+        self.renames = renames or []
+        self.namespaces = namespaces or []
+        self.transaction = None
+        # the undo_journal transaction that made the renames, None for loaded records
+
+    def to_dict(self):
+        return {"name": self.name, "rule": list(self.rule), "redirect_references": self.redirect_references,
+                "renames": self.renames, "namespaces": [list(namespaces) for namespaces in self.namespaces]}
+
+    @classmethod
+    def from_dict(cls, data):
+        return cls(data["name"], data["rule"], data.get("redirect_references", False), data.get("renames"),
+                   [tuple(namespaces) for namespaces in data.get("namespaces", [])])
+
+    def find_nodes(self):
+        """
+        Nodes the rule was applied to, in this scene: by UUID, then by the old
+        name for the nodes whose UUID is not here (another scene)
+        """
+        uuids = [uuid for uuid, old_name, new_name in self.renames if uuid]
+        found = dict(zip(cmds.ls(uuids, uuid=True), cmds.ls(uuids, long=True))) if uuids else {}
+
+        old_names = [old_name for uuid, old_name, new_name in self.renames if uuid not in found]
+        nodes = set(found.values())
+        if old_names:
+            nodes.update(cmds.ls(old_names, long=True) or [])
+
+        return sorted(nodes)
+
+    def replay(self):
+        """
+        Apply the same rule to the matching nodes of the current scene
+        """
+        nodes = self.find_nodes()
+        if self.redirect_references:
+            nodes.extend(cmds.ls(["{0}:*".format(old) for old, new in self.namespaces], long=True) or [])
+
+        return RenameEngine.rename(nodes, self.rule, self.name, self.redirect_references)
+
+    def revert(self):
+        """
+        Give every node renamed by this record its old name back, in one undo
+        step. When the rename is still the last tool operation it is reverted
+        through undo_journal, so both keep the same history.
+        """
+        if self.transaction is not None:
+            if self.transaction.reverted:
+                return 0
+                # already undone through undo_journal
+            if undo_journal.Transaction.history and undo_journal.Transaction.history[-1] is self.transaction:
+                undo_journal.undo()
+                return len(self.renames)
+            self.transaction.forget()
+
+        uuids = [uuid for uuid, old_name, new_name in self.renames if uuid]
+        nodes = dict(zip(cmds.ls(uuids, uuid=True), cmds.ls(uuids, long=True))) if uuids else {}
+        old_names = dict((uuid, old_name) for uuid, old_name, new_name in self.renames)
+
+        with undo_journal.Transaction("revert " + self.name, batch_size=len(nodes)) as transaction:
+            for uuid, node in sorted(nodes.items(), key=lambda item: item[1].count("|"), reverse=True):
+                transaction.rename(node, old_names[uuid])
+
+            if self.namespaces:
+                reference_files = RenameEngine.get_reference_files()
+                for old_namespace, new_namespace in reversed(self.namespaces):
+                    RenameEngine.rename_namespace(transaction, new_namespace, old_namespace, reference_files)
+
+        return len(nodes)
+
+
+class RenameScript(object):
+    """
+    An ordered list of RenameRecords saved to / loaded from a JSON file
+    """
+
+    FILE_VERSION = 1
+
+    def __init__(self, records=None):
+        self.records = records or []
+
+    def save(self, file_path):
+        with open(file_path, "w") as f:
+            json.dump({"version": self.FILE_VERSION, "records": [record.to_dict() for record in self.records]}, f, indent=1)
+
+    @classmethod
+    def load(cls, file_path):
+        with open(file_path, "r") as f:
+            data = json.load(f)
+
+        return cls([RenameRecord.from_dict(record) for record in data["records"]])
+
+    def replay(self):
+        return [record.replay() for record in self.records]
+
+    def revert(self):
+        return sum(record.revert() for record in reversed(self.records))
+
+
+def replay_files(script_path, scene_paths, save=True):
+    """
+    Headless batch: open every scene, replay the rename script on it and save.
+    Returns {scene path: renamed node count}.
+
+    mayapy -c "import maya.standalone; maya.standalone.initialize(); import object_renamer; object_renamer.replay_files('names.json', paths)"
+    """
+    script = RenameScript.load(script_path)
+
+    results = {}
+    for scene_path in scene_paths:
+        cmds.file(scene_path, open=True, force=True)
+        results[scene_path] = sum(report["renamed"] for report in script.replay())
+        if save:
+            cmds.file(save=True, force=True)
+
+        print("{0}: {1} renamed".format(scene_path, results[scene_path]))
+
+    return results
+
+
 class ObjectRenamerDialog(QtWidgets.QDialog):
 
     WINDOW_TITLE = "Object Renamer"
 
-    def __init__(self, parent=maya_main_window()):
+    dlg_instance = None
+
+    @classmethod
+    def show_dialog(cls):
+        if not cls.dlg_instance:
+            cls.dlg_instance = cls()
+        else:
+            cls.dlg_instance.update_selection()
+
+        if cls.dlg_instance.isHidden():
+            cls.dlg_instance.show()
+        else:
+            cls.dlg_instance.raise_()
+            cls.dlg_instance.activateWindow()
+
+    def __init__(self, parent=None):
+        if parent is None:
+            parent = maya_main_window()
         super(ObjectRenamerDialog, self).__init__(parent)
 
         self.setWindowTitle(self.WINDOW_TITLE)
@@ -28,7 +460,7 @@ class ObjectRenamerDialog(QtWidgets.QDialog):
             self.setWindowFlags(QtCore.Qt.Tool)
 
         self.setMinimumSize(300, 120)
-        self.selection = cmds.ls(selection=True, long=True)
+        self.update_selection()
 
         self.create_actions()
         self.create_widgets()
@@ -41,8 +473,16 @@ class ObjectRenamerDialog(QtWidgets.QDialog):
     def create_actions(self): #
         self.help_action = QtWidgets.QAction("Help", self)
 
+        self.save_script_action = QtWidgets.QAction("Save Rename Script...", self)
+        self.replay_script_action = QtWidgets.QAction("Replay Rename Script...", self)
+        self.revert_last_action = QtWidgets.QAction("Revert Last Rename", self)
+
     def create_widgets(self):
         self.menu_bar = QtWidgets.QMenuBar()
+        history_menu = self.menu_bar.addMenu("History")
+        history_menu.addAction(self.save_script_action)
+        history_menu.addAction(self.replay_script_action)
+        history_menu.addAction(self.revert_last_action)
         help_menu = self.menu_bar.addMenu("Help")
         help_menu.addAction(self.help_action)
 
@@ -73,6 +513,20 @@ class ObjectRenamerDialog(QtWidgets.QDialog):
         self.suffix_btn = QtWidgets.QPushButton("Go")
         self.suffix_label = QtWidgets.QLabel("SUFFIX")
 
+        # NAMESPACE
+        self.namespace_le = QtWidgets.QLineEdit()
+        self.new_namespace_le = QtWidgets.QLineEdit()
+        self.namespace_btn = QtWidgets.QPushButton("Go")
+        self.namespace_label = QtWidgets.QLabel("NAMESPACE")
+
+        self.redirect_references_cb = QtWidgets.QCheckBox("Rename namespaces of referenced nodes")
+
+        # NAMING CONVENTION
+        self.validate_btn = QtWidgets.QPushButton("Check Scene")
+        self.fix_naming_btn = QtWidgets.QPushButton("Fix")
+        self.fix_naming_btn.setEnabled(False)
+        self.naming_label = QtWidgets.QLabel("NAMING CONVENTION")
+
     def create_layout(self):
         rename_header = QtWidgets.QHBoxLayout()
         rename_header.addWidget(self.rename_label)
@@ -100,6 +554,20 @@ class ObjectRenamerDialog(QtWidgets.QDialog):
         suffix_layout.addWidget(self.suffix_le)
         suffix_layout.addWidget(self.suffix_btn)
 
+        namespace_header = QtWidgets.QHBoxLayout()
+        namespace_header.addWidget(self.namespace_label)
+        namespace_layout = QtWidgets.QHBoxLayout()
+        namespace_layout.addWidget(self.namespace_le)
+        new_namespace_layout = QtWidgets.QHBoxLayout()
+        new_namespace_layout.addWidget(self.new_namespace_le)
+        new_namespace_layout.addWidget(self.namespace_btn)
+
+        naming_header = QtWidgets.QHBoxLayout()
+        naming_header.addWidget(self.naming_label)
+        naming_layout = QtWidgets.QHBoxLayout()
+        naming_layout.addWidget(self.validate_btn)
+        naming_layout.addWidget(self.fix_naming_btn)
+
         form_layout = QtWidgets.QFormLayout()
         form_layout.addRow("", rename_header)
         form_layout.addRow("New Name:", rename_layout)
@@ -113,6 +581,14 @@ class ObjectRenamerDialog(QtWidgets.QDialog):
         form_layout.addWidget(self.divider_line)
         form_layout.addRow("", suffix_header)
         form_layout.addRow("Add Suffix", suffix_layout)
+        form_layout.addWidget(self.divider_line)
+        form_layout.addRow("", namespace_header)
+        form_layout.addRow("Namespace:", namespace_layout)
+        form_layout.addRow("New Namespace:", new_namespace_layout)
+        form_layout.addRow("", self.redirect_references_cb)
+        form_layout.addWidget(self.divider_line)
+        form_layout.addRow("", naming_header)
+        form_layout.addRow("", naming_layout)
 
         main_layout = QtWidgets.QVBoxLayout(self)
         main_layout.setSpacing(2)
@@ -121,6 +597,9 @@ class ObjectRenamerDialog(QtWidgets.QDialog):
 
     def create_connections(self):
         self.help_action.triggered.connect(self.help_tool)
+        self.save_script_action.triggered.connect(self.save_script)
+        self.replay_script_action.triggered.connect(self.replay_script)
+        self.revert_last_action.triggered.connect(self.revert_last)
 
         # RENAME
         self.rename_btn.clicked.connect(self.rename_obj)
@@ -131,40 +610,85 @@ class ObjectRenamerDialog(QtWidgets.QDialog):
         # ADD PREFIX
         self.prefix_btn.clicked.connect(self.add_prefix)
 
-        # ADD PREFIX
+        # ADD SUFFIX
         self.suffix_btn.clicked.connect(self.add_suffix)
 
-    def rename_obj(self):
-        new_name = self.rename_le.text()
+        # NAMESPACE
+        self.namespace_btn.clicked.connect(self.rename_namespace)
 
-        for obj in self.selection:
-            original_name = obj.split('|')[-1]
-            actual_name = cmds.rename(obj, new_name)
+        # NAMING CONVENTION
+        self.validate_btn.clicked.connect(self.validate_names)
+        self.fix_naming_btn.clicked.connect(self.fix_names)
 
-    def find_replace(self):
-        find_str = self.find_le.text()
-        replace_str = self.replace_le.text()
+    def update_selection(self):
+        self.selection = cmds.ls(selection=True, long=True)
 
-        for obj in self.selection:
-            original_name = obj.split('|')[-1]
-            new_name = original_name.replace(find_str, replace_str) or original_name
-            actual_name = cmds.rename(obj, new_name)
+    def rename_selection(self, name, rule):
+        report = RenameEngine.rename(self.selection, rule, name, self.redirect_references_cb.isChecked())
+        RenameEngine.print_report(report)
+        self.update_selection()
 
-    def add_prefix(self):
-        prefix = self.prefix_le.text()
+    def rename_obj(self):
+        self.rename_selection("rename_obj", ("rename", self.rename_le.text()))
+
+    def find_replace(self):
+        self.rename_selection("find_replace", ("replace", self.find_le.text(), self.replace_le.text()))
 
-        for obj in self.selection:
-            original_name = obj.split('|')[-1]
-            new_name = prefix + original_name
-            actual_name = cmds.rename(obj, new_name)
+    def add_prefix(self):
+        self.rename_selection("add_prefix", ("prefix", self.prefix_le.text()))
 
     def add_suffix(self):
-        suffix = self.suffix_le.text()
-
-        for obj in self.selection:
-            original_name = obj.split('|')[-1]
-            new_name = original_name + suffix
-            actual_name = cmds.rename(obj, new_name)
+        self.rename_selection("add_suffix", ("suffix", self.suffix_le.text()))
+
+    def rename_namespace(self):
+        old_namespace = self.namespace_le.text().strip(":")
+        new_namespace = self.new_namespace_le.text().strip(":")
+        if not cmds.namespace(exists=":" + old_namespace):
+            om.MGlobal.displayError("Namespace {0} does not exist".format(old_namespace))
+            return
+
+        with undo_journal.Transaction("rename_namespace") as transaction:
+            RenameEngine.rename_namespace(transaction, old_namespace, new_namespace)
+        self.update_selection()
+
+    def validate_names(self):
+        self.naming_issues = NamingValidator().validate()
+        NamingValidator.print_issues(self.naming_issues)
+        self.fix_naming_btn.setEnabled(any(issue["rule"] for issue in self.naming_issues))
+
+    def fix_names(self):
+        for report in NamingValidator().fix(self.naming_issues):
+            RenameEngine.print_report(report)
+
+        self.update_selection()
+        self.validate_names()
+
+    def save_script(self):
+        if not RenameEngine.history:
+            om.MGlobal.displayWarning("No renames to save")
+            return
+
+        file_path, selected_filter = QtWidgets.QFileDialog.getSaveFileName(self, "Save Rename Script", "", "Rename Script (*.json)")
+        if file_path:
+            RenameScript(list(RenameEngine.history)).save(file_path)
+
+    def replay_script(self):
+        file_path, selected_filter = QtWidgets.QFileDialog.getOpenFileName(self, "Replay Rename Script", "", "Rename Script (*.json)")
+        if not file_path:
+            return
+
+        for report in RenameScript.load(file_path).replay():
+            RenameEngine.print_report(report)
+        self.update_selection()
+
+    def revert_last(self):
+        if not RenameEngine.history:
+            om.MGlobal.displayWarning("No renames to revert")
+            return
+
+        reverted = RenameEngine.history.pop().revert()
+        om.MGlobal.displayInfo("Reverted {0} names".format(reverted))
+        self.update_selection()
 
     def show_context_menu(self, point):
         context_menu = QtWidgets.QMenu()
@@ -1,61 +1,91 @@
+import array
+import bisect
+import os
+import sys
+
 import maya.cmds as cmds
 import maya.mel as mel
 import maya.OpenMaya as om
-import maya.OpenMayaUI as omui
+
+SHARED_DIRS = ["Undo_Journal"]
+# folders of the shared modules, next to this tool's folder. The shelf launcher
+# adds them itself, this covers running the file on its own
+if "__file__" in globals():
+    for shared_dir in SHARED_DIRS:
+        shared_path = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), shared_dir)
+        if shared_path not in sys.path:
+            sys.path.append(shared_path)
+    # code pasted into the script editor has no __file__, see the README
+
+import undo_journal
+
 from PySide2 import QtCore
+from PySide2 import QtGui
 from PySide2 import QtWidgets
-from shiboken2 import wrapInstance
 
 class HelperMethods(object):
 
     @classmethod
     def retime_keys(cls, retime_value, move_to_next):
+        return cls.plan_insert(retime_value, move_to_next).apply()
+
+    @classmethod
+    def plan_insert(cls, retime_value, move_to_next):
+        """
+        Compute, without touching the scene, the key times after spacing the
+        keys from the selected range onwards retime_value frames apart (keys
+        after the range keep their spacing)
+        """
         range_start_time, range_end_time = cls.get_selected_range()
-        start_keyframe_time = cls.get_start_keyframe_time(range_start_time)
-        last_keyframe_time = cls.get_last_keyframe_time()
-        current_time = start_keyframe_time
+        curve_key_times = cls.get_curve_key_times()
 
-        new_keyframe_times = [start_keyframe_time]
+        all_times = sorted(set(time for times in curve_key_times.values() for time in times))
+        if not all_times:
+            return RetimePlan({})
 
-        while current_time != last_keyframe_time:
-            next_keyframe_time = cls.find_keyframe("next", current_time)
+        times_at_start = [time for time in all_times if time <= range_start_time]
+        start_keyframe_time = times_at_start[-1] if times_at_start else all_times[0]
 
-            if current_time < range_end_time:
-                time_diff = retime_value
-            else:
-                time_diff = next_keyframe_time - current_time
+        new_keyframe_times = {}
+        previous_time = None
+        for time in all_times:
+            if time < start_keyframe_time:
+                continue
 
-            new_keyframe_times.append(new_keyframe_times[-1] + time_diff)
-            current_time = next_keyframe_time
+            if previous_time is None:
+                new_keyframe_times[time] = time
+            elif previous_time < range_end_time:
+                new_keyframe_times[time] = new_keyframe_times[previous_time] + retime_value
+            else:
+                new_keyframe_times[time] = new_keyframe_times[previous_time] + time - previous_time
+            previous_time = time
 
-        if len(new_keyframe_times) > 1:
-            cls.retime_keys_recursive(start_keyframe_time, 0, new_keyframe_times)
+        key_times = {}
+        for curve, times in curve_key_times.items():
+            key_times[curve] = (times, array.array("d", [new_keyframe_times.get(time, time) for time in times]))
 
-        first_keyframe_time = cls.find_keyframe("first")
+        first_keyframe_time = all_times[0]
+        later_times = [time for time in all_times if time > start_keyframe_time]
 
         if move_to_next and range_start_time >= first_keyframe_time:
-            next_keyframe_time = cls.find_keyframe("next", start_keyframe_time)
-            cls.set_current_time(next_keyframe_time)
+            current_time = new_keyframe_times[later_times[0]] if later_times else start_keyframe_time
         elif range_end_time > first_keyframe_time:
-            cls.set_current_time(start_keyframe_time)
+            current_time = start_keyframe_time
         else:
-            cls.set_current_time(range_start_time)
+            current_time = range_start_time
 
-    @classmethod
-    def retime_keys_recursive(cls, current_time, index, new_keyframe_times):
-        if index >= len(new_keyframe_times):
-            return
+        return RetimePlan(key_times, current_time)
 
-        updated_keyframe_time = new_keyframe_times[index]
-
-        next_keyframe_time = cls.find_keyframe("next", current_time)
+    @classmethod
+    def get_curve_key_times(cls):
+        """
+        {curve: key times} for every animation curve of the selection, one query per curve
+        """
+        curve_key_times = {}
+        for curve in cmds.keyframe(query=True, name=True) or []:
+            curve_key_times[curve] = array.array("d", cmds.keyframe(curve, query=True, timeChange=True) or [])
 
-        if updated_keyframe_time < next_keyframe_time:
-            cls.change_keyframe_time(current_time, updated_keyframe_time)
-            cls.retime_keys_recursive(next_keyframe_time, index + 1, new_keyframe_times)
-        else:
-            cls.retime_keys_recursive(next_keyframe_time, index + 1, new_keyframe_times)
-            cls.change_keyframe_time(current_time, updated_keyframe_time)
+        return curve_key_times
 
     @classmethod
     def set_current_time(cls, time):
@@ -76,33 +106,359 @@ class HelperMethods(object):
 
         return cmds.findKeyframe(**kwargs)
 
+class RetimePlan(object):
+    """
+    Old and new key times of every curve, computed up front so a retime can
+    be previewed and then applied in one batched edit
+    """
+
+    def __init__(self, key_times, current_time=None):
+        self.key_times = key_times
+        # {curve: (times, new_times)}
+        self.current_time = current_time
+
+    def moves(self):
+        """
+        Sorted unique (old time, new time) pairs over all curves
+        """
+        pairs = set()
+        for times, new_times in self.key_times.values():
+            pairs.update(zip(times, new_times))
+
+        return sorted(pairs)
+
+    def is_current(self):
+        """
+        False if keys were added or removed since the plan was computed
+        """
+        for curve, (times, new_times) in self.key_times.items():
+            if not cmds.objExists(curve) or cmds.keyframe(curve, query=True, keyframeCount=True) != len(times):
+                return False
+
+        return True
+
+    def apply(self):
+        moved = RangeRetimer.apply(self.key_times)
+
+        if self.current_time is not None:
+            HelperMethods.set_current_time(self.current_time)
+
+        return moved
+
+
+class WarpPlan(RetimePlan):
+    """
+    Preview of a time warp: the key moves show where the keys will appear,
+    but applying only sets the warp, the keys themselves are left alone
+    """
+
+    def __init__(self, key_times, mode, value, time_range):
+        super(WarpPlan, self).__init__(key_times)
+        self.mode = mode
+        self.value = value
+        self.time_range = time_range
+
+    def apply(self):
+        return TimeWarp.apply(self.mode, self.value, self.time_range)
+
+class RangeRetimer(object):
+    """
+    Scale, fit or evenly space the keys inside the selected time range of
+    every animation curve of the selection. Keys after the range are shifted
+    so their timing is kept.
+    """
+
+    MODES = ["Scale", "Fit To Duration", "Uniform Spacing"]
+    BATCH_SIZE = 5000
+    # number of key edits per mel.eval call
+
+    @classmethod
+    def retime(cls, mode, value):
+        return cls.plan(mode, value).apply()
+
+    @classmethod
+    def plan(cls, mode, value):
+        range_start_time, range_end_time = HelperMethods.get_selected_range()
+
+        key_times = {}
+        for curve, times in HelperMethods.get_curve_key_times().items():
+            key_times[curve] = (times, cls.map_times(times, range_start_time, range_end_time, mode, value))
+
+        return RetimePlan(key_times)
+
+    @classmethod
+    def map_times(cls, times, range_start_time, range_end_time, mode, value):
+        """
+        Return the new time of every key in times (sorted, may be sub-frame).
+        value is the scale factor, the target duration or the spacing in frames.
+        """
+        new_times = array.array("d", times)
+        inside = [i for i, time in enumerate(times) if range_start_time <= time <= range_end_time]
+        if not inside or value <= 0:
+            return new_times
+
+        range_length = range_end_time - range_start_time
+        if mode == "Uniform Spacing":
+            first_time = times[inside[0]]
+            for n, i in enumerate(inside):
+                new_times[i] = first_time + n * value
+            new_range_end_time = new_times[inside[-1]] + (range_end_time - times[inside[-1]])
+        else:
+            if mode == "Fit To Duration":
+                factor = value / range_length if range_length else 1.0
+            else:
+                factor = value
+            for i in inside:
+                new_times[i] = range_start_time + (times[i] - range_start_time) * factor
+            new_range_end_time = range_start_time + range_length * factor
+
+        shift = new_range_end_time - range_end_time
+        for i in range(inside[-1] + 1, len(times)):
+            new_times[i] = times[i] + shift
+
+        return new_times
+
+    @classmethod
+    def edit_order(cls, times, new_times):
+        """
+        Order in which keys can be moved one by one without ever landing on
+        another key: keys moving later last to first, then keys moving earlier
+        first to last. Works because the mapping keeps the key order, which
+        also keeps every key index valid throughout.
+        """
+        later = [i for i in range(len(times)) if new_times[i] > times[i]]
+        later.reverse()
+        earlier = [i for i in range(len(times)) if new_times[i] < times[i]]
+        return later + earlier
+
+    @classmethod
+    def apply(cls, new_key_times):
+        """
+        new_key_times: {curve: (times, new_times)}, applied as batched
+        keyframe edits. Returns the number of keys moved.
+        """
+        commands = []
+        for curve, (times, new_times) in new_key_times.items():
+            for i in cls.edit_order(times, new_times):
+                commands.append("keyframe -edit -index {0} -absolute -timeChange {1:.10g} {2};".format(i, new_times[i], curve))
+
+        for i in range(0, len(commands), cls.BATCH_SIZE):
+            mel.eval("".join(commands[i:i + cls.BATCH_SIZE]))
+
+        return len(commands)
+
+
+class TimeWarp(object):
+    """
+    Non-destructive retime: the selected curves are driven through one shared
+    time-to-time curve (time1 -> warp -> each curve's input), so a retime only
+    edits the few warp keys. bake() writes the warped timing back into the
+    keys and removes the warp.
+    """
+
+    WARP_NAME = "retimeWarp"
+    MODES = ["Scale", "Fit To Duration"]
+    # a warp with a handful of keys can only express a stretch of the range
+
+    @classmethod
+    def get_warp(cls):
+        return cls.WARP_NAME if cmds.objExists(cls.WARP_NAME) else None
+
+    @classmethod
+    def create(cls):
+        warp = cmds.createNode("animCurveTT", name=cls.WARP_NAME)
+        cmds.connectAttr("time1.outTime", warp + ".input")
+        return warp
+
+    @classmethod
+    def warp_keys(cls, range_start_time, range_end_time, mode, value):
+        """
+        (scene time, curve time) pairs: identity before the range, stretched
+        inside it, identity (offset) after it
+        """
+        new_range_end_time = RangeRetimer.map_times([range_start_time, range_end_time], range_start_time, range_end_time, mode, value)[1]
+
+        return [(range_start_time - 1, range_start_time - 1), (range_start_time, range_start_time),
+                (new_range_end_time, range_end_time), (new_range_end_time + 1, range_end_time + 1)]
+
+    @classmethod
+    def plan(cls, mode, value):
+        """
+        WarpPlan for the selected range, previewed like a key retime
+        """
+        time_range = HelperMethods.get_selected_range()
+        key_times = RangeRetimer.plan(mode, value).key_times
+        return WarpPlan(key_times, mode, value, time_range)
+
+    @classmethod
+    def apply(cls, mode, value, time_range=None):
+        """
+        Set the warp for the selected range, or time_range (replacing any
+        previous warp settings) and drive the selected curves through it
+        """
+        range_start_time, range_end_time = time_range or HelperMethods.get_selected_range()
+        warp = cls.get_warp() or cls.create()
+
+        cmds.cutKey(warp, clear=True)
+        for time, warped_time in cls.warp_keys(range_start_time, range_end_time, mode, value):
+            cmds.setKeyframe(warp, time=time, value=warped_time, inTangentType="linear", outTangentType="linear")
+        cmds.setInfinity(warp, preInfinite="linear", postInfinite="linear")
+
+        return cls.connect(warp, [curve for curve in HelperMethods.get_curve_key_times() if curve != warp])
+
+    @classmethod
+    def connect(cls, warp, curves):
+        """
+        Connect the warp to every curve whose input is free, in one batch.
+        Returns the number of newly connected curves.
+        """
+        if not curves:
+            return 0
+
+        connected = cmds.listConnections([curve + ".input" for curve in curves], source=True, destination=False, connections=True, plugs=True) or []
+        driven_plugs = set(connected[0::2])
+
+        commands = ['connectAttr "{0}.output" "{1}.input";'.format(warp, curve) for curve in curves if curve + ".input" not in driven_plugs]
+        if commands:
+            mel.eval("".join(commands))
+
+        return len(commands)
+
     @classmethod
-    def change_keyframe_time(cls, current_time, new_time):
-        cmds.keyframe(e=True, time=(current_time, current_time), timeChange=new_time)
+    def get_warped_curves(cls, warp):
+        return sorted(set(cmds.listConnections(warp + ".output", source=False, destination=True) or []))
 
     @classmethod
-    def get_start_keyframe_time(cls, range_start_time):
-        start_times = cmds.keyframe(q=True, time=(range_start_time, range_start_time))
-        if start_times:
-            return start_times[0]
+    def unwarp(cls, curve_time, times, warped_times):
+        """
+        Scene time at which the (increasing, piecewise linear) warp reaches curve_time
+        """
+        k = bisect.bisect_right(warped_times, curve_time) - 1
+        k = min(max(k, 0), len(times) - 2)
+        slope = (times[k + 1] - times[k]) / (warped_times[k + 1] - warped_times[k])
+        return times[k] + (curve_time - warped_times[k]) * slope
+
+    @classmethod
+    def plan_bake(cls):
+        warp = cls.get_warp()
+        if not warp:
+            return RetimePlan({})
+
+        times = cmds.keyframe(warp, query=True, timeChange=True)
+        warped_times = cmds.keyframe(warp, query=True, valueChange=True)
 
-        start_time = cls.find_keyframe("previous", range_start_time)
-        return start_time
+        key_times = {}
+        for curve in cls.get_warped_curves(warp):
+            curve_times = array.array("d", cmds.keyframe(curve, query=True, timeChange=True) or [])
+            key_times[curve] = (curve_times, array.array("d", [cls.unwarp(time, times, warped_times) for time in curve_times]))
+
+        return RetimePlan(key_times)
+
+    @classmethod
+    def bake(cls):
+        """
+        Flatten the warp into the keys of every warped curve in one batched
+        pass, then delete the warp. Returns the number of keys moved.
+        """
+        plan = cls.plan_bake()
+        cls.remove()
+        return plan.apply()
 
     @classmethod
-    def get_last_keyframe_time(cls):
-        return cls.find_keyframe("last")
+    def remove(cls):
+        """
+        Delete the warp without baking, the curves go back to their own timing
+        """
+        warp = cls.get_warp()
+        if warp:
+            cmds.delete(warp)
+
+
+class TimelinePreview(QtWidgets.QWidget):
+    """
+    Draws the current key times on a top track and the planned ones on a
+    bottom track, with a ghosted line from every old position to its new one
+    """
+
+    MARGIN = 10
+    MAX_LINES = 2000
+    # dense plans are thinned out to this many drawn moves
+
+    def __init__(self, parent=None):
+        super(TimelinePreview, self).__init__(parent)
+        self.setMinimumHeight(70)
+        self.moves = []
+
+    def set_plan(self, plan):
+        self.moves = plan.moves() if plan else []
+        self.update()
+
+    def paintEvent(self, e):
+        painter = QtGui.QPainter(self)
+        painter.fillRect(self.rect(), self.palette().color(QtGui.QPalette.Base))
+
+        if not self.moves:
+            painter.drawText(self.rect(), QtCore.Qt.AlignCenter, "No preview")
+            return
+
+        low = min(min(old, new) for old, new in self.moves)
+        high = max(max(old, new) for old, new in self.moves)
+        span = (high - low) or 1.0
+        width = self.width() - 2 * self.MARGIN
+        old_y = 20
+        new_y = self.height() - 20
+
+        def x(time):
+            return self.MARGIN + (time - low) / span * width
+
+        step = max(1, len(self.moves) // self.MAX_LINES)
+        shown = self.moves[::step]
+
+        painter.setPen(QtGui.QColor(255, 200, 0, 60))
+        for old, new in shown:
+            painter.drawLine(QtCore.QPointF(x(old), old_y), QtCore.QPointF(x(new), new_y))
+
+        painter.setPen(QtGui.QColor(150, 150, 150))
+        for old, new in shown:
+            painter.drawLine(QtCore.QPointF(x(old), old_y - 5), QtCore.QPointF(x(old), old_y + 5))
+
+        painter.setPen(QtGui.QColor(255, 200, 0))
+        for old, new in shown:
+            painter.drawLine(QtCore.QPointF(x(new), new_y - 5), QtCore.QPointF(x(new), new_y + 5))
+
+        painter.setPen(self.palette().color(QtGui.QPalette.Text))
+        painter.drawText(self.MARGIN, old_y - 7, "{0:g}".format(low))
+        painter.drawText(self.width() - self.MARGIN - 40, old_y - 7, 40, 12, QtCore.Qt.AlignRight, "{0:g}".format(high))
+
 
 class Retiming_Tool(QtWidgets.QDialog):
 
     WINDOW_TITLE = "Retiming Tool"
 
+    dlg_instance = None
+
+    @classmethod
+    def show_dialog(cls):
+        if not cls.dlg_instance:
+            cls.dlg_instance = cls()
+
+        if cls.dlg_instance.isHidden():
+            cls.dlg_instance.show()
+        else:
+            cls.dlg_instance.raise_()
+            cls.dlg_instance.activateWindow()
+
     @classmethod
     def maya_main_window(cls):
         """
-        Return the Maya main window widget as a Python object
+        Return the Maya main window widget as a Python object (None in mayapy)
         """
+        import maya.OpenMayaUI as omui
+        from shiboken2 import wrapInstance
+
         main_window_ptr = omui.MQtUtil.mainWindow()
+        if main_window_ptr is None:
+            return None
         return wrapInstance(long(main_window_ptr), QtWidgets.QWidget)
 
     def __init__(self):
@@ -136,15 +492,37 @@ class Retiming_Tool(QtWidgets.QDialog):
         self.spinbox.setRange(1,50)
         self.go_btn = QtWidgets.QPushButton("Go")
         self.go_btn.setFixedWidth(50)
+        self.preview_btn = QtWidgets.QPushButton("Preview")
 
         self.next_frame_cb = QtWidgets.QCheckBox("Next Frame")
 
+        self.range_mode_cmb = QtWidgets.QComboBox()
+        self.range_mode_cmb.addItems(RangeRetimer.MODES)
+        self.range_value_spinbox = QtWidgets.QDoubleSpinBox()
+        self.range_value_spinbox.setDecimals(3)
+        self.range_value_spinbox.setRange(0.001, 100000.0)
+        self.range_value_spinbox.setValue(1.0)
+        self.range_btn = QtWidgets.QPushButton("Apply")
+        self.range_btn.setFixedWidth(50)
+        self.range_preview_btn = QtWidgets.QPushButton("Preview")
+
+        self.warp_cb = QtWidgets.QCheckBox("Time Warp")
+        self.warp_cb.setToolTip("Retime through a shared time warp curve instead of moving keys")
+        self.bake_warp_btn = QtWidgets.QPushButton("Bake Warp")
+        self.remove_warp_btn = QtWidgets.QPushButton("Remove Warp")
+
+        self.timeline_preview = TimelinePreview()
+        self.confirm_btn = QtWidgets.QPushButton("Confirm")
+        self.discard_btn = QtWidgets.QPushButton("Discard")
+        self.set_plan(None)
+
     def create_layouts(self):
         form_layout = QtWidgets.QHBoxLayout()
         form_layout.addStretch()
         form_layout.addWidget(self.label)
         form_layout.addWidget(self.spinbox)
         form_layout.addWidget(self.go_btn)
+        form_layout.addWidget(self.preview_btn)
         form_layout.addStretch()
 
         next_frame_layout = QtWidgets.QHBoxLayout()
@@ -152,31 +530,110 @@ class Retiming_Tool(QtWidgets.QDialog):
         next_frame_layout.addWidget(self.next_frame_cb)
         next_frame_layout.addStretch()
 
+        range_layout = QtWidgets.QHBoxLayout()
+        range_layout.addStretch()
+        range_layout.addWidget(self.range_mode_cmb)
+        range_layout.addWidget(self.range_value_spinbox)
+        range_layout.addWidget(self.range_btn)
+        range_layout.addWidget(self.range_preview_btn)
+        range_layout.addStretch()
+
+        warp_layout = QtWidgets.QHBoxLayout()
+        warp_layout.addStretch()
+        warp_layout.addWidget(self.warp_cb)
+        warp_layout.addWidget(self.bake_warp_btn)
+        warp_layout.addWidget(self.remove_warp_btn)
+        warp_layout.addStretch()
+
+        preview_btn_layout = QtWidgets.QHBoxLayout()
+        preview_btn_layout.addStretch()
+        preview_btn_layout.addWidget(self.confirm_btn)
+        preview_btn_layout.addWidget(self.discard_btn)
+
         main_layout = QtWidgets.QVBoxLayout(self)
         main_layout.setContentsMargins(2, 2, 2, 2)
         main_layout.setSpacing(2)
         main_layout.setMenuBar(self.menu_bar)
         main_layout.addLayout(form_layout)
         main_layout.addLayout(next_frame_layout)
+        main_layout.addLayout(range_layout)
+        main_layout.addLayout(warp_layout)
+        main_layout.addWidget(self.timeline_preview)
+        main_layout.addLayout(preview_btn_layout)
 
     def create_connections(self):
         self.about_action.triggered.connect(self.about)
         
         self.go_btn.clicked.connect(self.retime)
+        self.range_btn.clicked.connect(self.retime_range)
+        self.warp_cb.toggled.connect(self.update_range_modes)
+        self.bake_warp_btn.clicked.connect(self.bake_warp)
+        self.remove_warp_btn.clicked.connect(self.remove_warp)
+
+        self.preview_btn.clicked.connect(self.preview)
+        self.range_preview_btn.clicked.connect(self.preview_range)
+        self.confirm_btn.clicked.connect(self.confirm)
+        self.discard_btn.clicked.connect(lambda: self.set_plan(None))
 
     def retime(self):
         spin_value = self.spinbox.value()
         move_to_next = self.next_frame_cb.isChecked()
 
-        cmds.undoInfo(openChunk=True)
+        if spin_value != 0:
+            with undo_journal.Transaction("retime"):
+                HelperMethods.retime_keys(spin_value, move_to_next)
 
-        if move_to_next:
-            print "True"
-        else:
-            print "False"
+        self.set_plan(None)
 
-        if spin_value != 0:
-            HelperMethods.retime_keys(spin_value, False, move_to_next)
+    def retime_range(self):
+        mode = self.range_mode_cmb.currentText()
+        value = self.range_value_spinbox.value()
+
+        with undo_journal.Transaction("retimeRange"):
+            if self.warp_cb.isChecked():
+                TimeWarp.apply(mode, value)
+            else:
+                RangeRetimer.retime(mode, value)
+
+        self.set_plan(None)
+
+    def update_range_modes(self, warp):
+        self.set_plan(None)
+        # a pending plan was made for the other kind of retime
+        self.range_mode_cmb.clear()
+        self.range_mode_cmb.addItems(TimeWarp.MODES if warp else RangeRetimer.MODES)
+
+    def bake_warp(self):
+        with undo_journal.Transaction("bakeWarp"):
+            TimeWarp.bake()
+
+    def remove_warp(self):
+        with undo_journal.Transaction("removeWarp"):
+            TimeWarp.remove()
+
+    def preview(self):
+        self.set_plan(HelperMethods.plan_insert(self.spinbox.value(), self.next_frame_cb.isChecked()))
+
+    def preview_range(self):
+        retimer = TimeWarp if self.warp_cb.isChecked() else RangeRetimer
+        self.set_plan(retimer.plan(self.range_mode_cmb.currentText(), self.range_value_spinbox.value()))
+
+    def set_plan(self, plan):
+        self.plan = plan
+        self.timeline_preview.set_plan(plan)
+        self.confirm_btn.setEnabled(plan is not None)
+        self.discard_btn.setEnabled(plan is not None)
+
+    def confirm(self):
+        if not self.plan.is_current():
+            om.MGlobal.displayWarning("Keys changed since the preview, preview again before confirming")
+            self.set_plan(None)
+            return
+
+        with undo_journal.Transaction("retime"):
+            self.plan.apply()
+
+        self.set_plan(None)
 
     def show_context_menu(self, point):
         context_menu = QtWidgets.QMenu()
@@ -184,7 +641,7 @@ class Retiming_Tool(QtWidgets.QDialog):
         context_menu.exec_(self.mapToGlobal(point))
 
     def about(self):
-            QtWidgets.QMessageBox.about(self, "About Retiming Tool", "Select an object and then specify number of desired frames between keys. Check \"Next Frame\" to automatically move to the next frame.")
+            QtWidgets.QMessageBox.about(self, "About Retiming Tool", "Select an object and then specify number of desired frames between keys. Check \"Next Frame\" to automatically move to the next frame.\n\nTo scale the keys in the highlighted time range, fit them to a duration in frames or space them evenly, pick a mode, enter the factor, duration or spacing and press Apply.\n\nPreview shows the old and new key positions without changing the scene, Confirm then applies them.\n\nWith \"Time Warp\" checked, Apply (or Confirm after a Preview) drives the selected curves through a shared warp curve instead of moving their keys. Bake Warp writes the warped timing into the keys.")
 
 if __name__ == "__main__":
 
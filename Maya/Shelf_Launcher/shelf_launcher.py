@@ -0,0 +1,145 @@
+"""
+Shelf launcher for the tools in this repo.
+
+Tool modules (and with them PySide2, shiboken2 and the OpenMaya APIs) are only
+imported the first time a tool is launched. Dialog based tools are reused
+through their show_dialog() singleton, cmds based windows are shown again if
+they still exist. Import and open times are recorded per tool.
+
+Usage (script editor or shelf button):
+    import shelf_launcher
+    shelf_launcher.install_shelf()
+    shelf_launcher.launch("retiming_tool")
+    shelf_launcher.print_startup_report()
+"""
+
+import importlib
+import os
+import sys
+import timeit
+
+import maya.cmds as cmds
+
+
+MAYA_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+SHELF_NAME = "MayaProjects"
+
+SHARED_DIRS = ["Undo_Journal", "Cmds_Profiler", "Anim_Cache"]
+# modules shared by the tools
+
+
+class Tool(object):
+    """
+    Describes how to import and open one tool
+
+    kind "dialog": a QDialog subclass with a show_dialog() classmethod
+    kind "window": a cmds window class, opened by calling open_method on an instance
+    """
+
+    def __init__(self, name, label, folder, module_name, class_name, kind, open_method=None, window_attr=None, image="pythonFamily.png"):
+        self.name = name
+        self.label = label
+        self.folder = folder
+        self.module_name = module_name
+        self.class_name = class_name
+        self.kind = kind
+        self.open_method = open_method
+        self.window_attr = window_attr
+        self.image = image
+
+        self.module = None
+        self.instance = None
+        self.timings = {"import": None, "first_open": None, "last_open": None, "opens": 0}
+
+    def load(self):
+        if self.module:
+            return self.module
+
+        for folder in SHARED_DIRS + [self.folder]:
+            path = os.path.join(MAYA_DIR, folder)
+            if path not in sys.path:
+                sys.path.append(path)
+
+        start = timeit.default_timer()
+        self.module = importlib.import_module(self.module_name)
+        self.timings["import"] = timeit.default_timer() - start
+
+        return self.module
+
+    def open(self):
+        tool_class = getattr(self.load(), self.class_name)
+
+        start = timeit.default_timer()
+        if self.kind == "dialog":
+            tool_class.show_dialog()
+        else:
+            self.open_window(tool_class)
+        elapsed = timeit.default_timer() - start
+
+        if self.timings["first_open"] is None:
+            self.timings["first_open"] = elapsed
+        self.timings["last_open"] = elapsed
+        self.timings["opens"] += 1
+
+    def open_window(self, tool_class):
+        if not self.instance:
+            self.instance = tool_class()
+
+        window_name = getattr(self.instance, self.window_attr)
+        if cmds.window(window_name, exists=True):
+            cmds.showWindow(window_name)
+        else:
+            getattr(self.instance, self.open_method)()
+
+
+TOOLS = [
+    Tool("transform_table", "Transform", "Transform_Obj", "tranform_obj", "TransformTableDialog", "dialog", image="polyCube.png"),
+    Tool("object_renamer", "Rename", "Object_Renamer", "object_renamer", "ObjectRenamerDialog", "dialog"),
+    Tool("import_save", "File", "Import_Save", "import_save", "OpenImportDialog", "dialog", image="fileOpen.png"),
+    Tool("retiming_tool", "Retime", "Retiming_Tool", "retiming_tool", "Retiming_Tool", "dialog"),
+    Tool("tweener", "Tween", "Simple_Tweener", "tweener", "TweenerWindow", "window", "show", "windowName", "bezNormalSelect.png"),
+    Tool("key_reducer", "Reduce", "Key_Reducer", "key_reducer", "KeyReducerWindow", "window", "show", "windowName"),
+    Tool("wireframe_colors", "Wire", "Wireframe_Color", "wireframe_colors", "WireframeColorsUi", "window", "display", "WINDOW_NAME", "colorProfile.png"),
+]
+
+TOOLS_BY_NAME = dict((tool.name, tool) for tool in TOOLS)
+
+
+def launch(name):
+    TOOLS_BY_NAME[name].open()
+
+
+def startup_report():
+    """
+    Return {tool name: timings} for every tool launched in this session
+    """
+    return dict((tool.name, dict(tool.timings)) for tool in TOOLS if tool.module)
+
+
+def print_startup_report():
+    print("{0:<18}{1:>10}{2:>12}{3:>12}{4:>7}".format("tool", "import", "first open", "last open", "opens"))
+    for name, timings in sorted(startup_report().items()):
+        seconds = ["n/a" if timings[key] is None else "{0:.4f}".format(timings[key]) for key in ("import", "first_open", "last_open")]
+        # a tool that was imported but failed to open has no open timings
+        print("{0:<18}{1:>10}{2:>12}{3:>12}{4:>7}".format(name, seconds[0], seconds[1], seconds[2], timings["opens"]))
+
+
+def install_shelf():
+    """
+    (Re)create the shelf tab with one button per tool
+    """
+    import maya.mel as mel
+
+    top_level_shelf = mel.eval("$tempVar = $gShelfTopLevel")
+    if cmds.shelfLayout(SHELF_NAME, exists=True):
+        cmds.deleteUI(SHELF_NAME, layout=True)
+
+    shelf = cmds.shelfLayout(SHELF_NAME, parent=top_level_shelf)
+
+    launcher_dir = os.path.dirname(os.path.abspath(__file__)).replace("\\", "/")
+    for tool in TOOLS:
+        command = "import sys\nif '{0}' not in sys.path: sys.path.append('{0}')\nimport shelf_launcher\nshelf_launcher.launch('{1}')".format(launcher_dir, tool.name)
+        cmds.shelfButton(parent=shelf, label=tool.label, imageOverlayLabel=tool.label, image=tool.image, annotation=tool.label, command=command, sourceType="python")
+
+    return shelf
@@ -1,113 +1,546 @@
+import array
+import json
+import os
+import sys
+import timeit
+
 from maya import cmds
+from maya import mel
+import maya.api.OpenMaya as om2
+
+SHARED_DIRS = ["Undo_Journal", "Anim_Cache"]
+# folders of the shared modules, next to this tool's folder. The shelf launcher
+# adds them itself, this covers running the file on its own
+if "__file__" in globals():
+    for shared_dir in SHARED_DIRS:
+        shared_path = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), shared_dir)
+        if shared_path not in sys.path:
+            sys.path.append(shared_path)
+    # code pasted into the script editor has no __file__, see the README
+
+import anim_cache
+import undo_journal
+
+ATTR_MASK_CACHE = {}
+# node -> {animated attribute: anim curve}, cleared on selection change or when an anim curve is connected or disconnected
+
+BATCH_SIZE = 5000
+# number of keys per mel.eval call when writing poses
+
+TIME_CURVE_TYPES = ["animCurveTA", "animCurveTL", "animCurveTT", "animCurveTU"]
+# anim curves keyed on time, the only ones the tweener reads and writes
+
+POSES = {}
+# poses captured from the UI, by slot name
 
 def get_obj(attrs=None, selection=True):
-'''
-Get selected object
-'''
+    '''
+    Get selected object
+    '''
     return cmds.ls(selection=True)[0]
 
 def get_previous_frames(keyframes, currentTime):
-'''
-Get previous frame based on location of current frame
-'''
+    '''
+    Get previous frame based on location of current frame
+    '''
     return [frame for frame in keyframes if frame < currentTime]
 
 def get_next_frames(keyframes, currentTime):
-'''
-Get next frame based on location of current frame
-'''
+    '''
+    Get next frame based on location of current frame
+    '''
     return [frame for frame in keyframes if frame > currentTime]
 
 def get_attr_full(obj, attr):
-'''
-Get all attributes of current object
-'''
+    '''
+    Get all attributes of current object
+    '''
     return '%s.%s' % (obj, attr)
 
 def get_all_keyframes(attrFull):
-'''
-Get all keyframes 
-'''
+    '''
+    Get all keyframes
+    '''
     return cmds.keyframe(attrFull, query=True)
 
-def tweenUtils(attrs, obj, currentTime, percentage):
-'''
-Performs actual tweening based on input values
-'''
-    for attr in attrs:
-        attrFull = get_attr_full(obj, attr)
+def get_anim_curves(obj):
+    '''
+    Get {attribute: anim curve} for the object, found with one connection
+    query per node and cached between calls
+    '''
+    if obj not in ATTR_MASK_CACHE:
+        connections = cmds.listConnections(obj, source=True, destination=False, type="animCurve", connections=True, plugs=True) or []
+        curves_by_attr = dict((plug.split('.', 1)[1], curve.split('.', 1)[0]) for plug, curve in zip(connections[0::2], connections[1::2]))
+        # connections come back as [plug on obj, curve plug, ...]
+
+        timed = set(cmds.ls(list(set(curves_by_attr.values())), type=TIME_CURVE_TYPES) or []) if curves_by_attr else set()
+        ATTR_MASK_CACHE[obj] = dict((attr, curve) for attr, curve in curves_by_attr.items() if curve in timed)
+        # set driven key curves (animCurveU*) are driven by another attribute, not time
 
-        keyframes = get_all_keyframes(attrFull)
+    return ATTR_MASK_CACHE[obj]
+
+def get_animated_attrs(obj):
+    '''
+    Get the attributes of the object driven by animation curves
+    '''
+    return sorted(get_anim_curves(obj))
+
+def get_channel_box_attrs(obj):
+    '''
+    Get the long names of the attributes selected in the channel box
+    '''
+    if not cmds.channelBox('mainChannelBox', exists=True):
+        return []
 
-        if not keyframes:
-            continue
+    selected = cmds.channelBox('mainChannelBox', query=True, selectedMainAttributes=True) or []
+    return [cmds.attributeQuery(attr, node=obj, longName=True) for attr in selected if cmds.attributeQuery(attr, node=obj, exists=True)]
 
-        previousKeyframes = get_previous_frames(keyframes, currentTime)
+def resolve_attrs(obj):
+    '''
+    Get the animated attributes to tween, limited to the channel box selection if there is one
+    '''
+    animated = get_animated_attrs(obj)
+    selected = get_channel_box_attrs(obj)
 
-        laterKeyframes = get_next_frames(keyframes, currentTime)
+    if selected:
+        return [attr for attr in animated if attr in selected]
 
-        if not previousKeyframes and not laterKeyframes:
-            continue
+    return animated
 
-        previousFrame = max(previousKeyframes) if previousKeyframes else None
-        nextFrame = min(laterKeyframes) if laterKeyframes else None
+def clear_attr_cache(*args):
+    '''
+    Forget the cached animated attributes
+    '''
+    ATTR_MASK_CACHE.clear()
 
-        if not previousFrame or not nextFrame:
-            continue
+def on_connection_changed(source_plug, destination_plug, made, *args):
+    '''
+    Forget the cached animated attributes when an anim curve is connected or
+    disconnected: keys set on a new attribute, curves deleted or replaced
+    '''
+    if ATTR_MASK_CACHE and (source_plug.node().hasFn(om2.MFn.kAnimCurve) or destination_plug.node().hasFn(om2.MFn.kAnimCurve)):
+        ATTR_MASK_CACHE.clear()
 
+class Pose(object):
+    '''
+    Values of animated attributes at one moment, kept as parallel lists of
+    plugs and curves plus one array of values so poses blend as array
+    operations and are written back in bulk
+    '''
 
-        previousValue = cmds.getAttr(attrFull, time=previousFrame)
-        nextValue = cmds.getAttr(attrFull, time=nextFrame)
+    def __init__(self, plugs, curves, values):
+        self.plugs = plugs
+        self.curves = curves
+        self.values = values
+
+    @classmethod
+    def get_channels(cls, objs, attrs=None):
+        '''
+        Get ([obj.attr plugs], [anim curves]) of the objects' animated (or given) attributes
+        '''
+        plugs = []
+        curves = []
+        for obj in objs:
+            curves_by_attr = get_anim_curves(obj)
+            for attr in (attrs or resolve_attrs(obj)):
+                if attr in curves_by_attr:
+                    plugs.append(get_attr_full(obj, attr))
+                    curves.append(curves_by_attr[attr])
+
+        return plugs, curves
+
+    @classmethod
+    def evaluate(cls, curves, time):
+        '''
+        Values of all the curves at one time, from a baked cache when one
+        holds them, otherwise with a single keyframe query
+        '''
+        if not curves:
+            return array.array('d')
+
+        cached = anim_cache.lookup(curves, time)
+        if cached is not None:
+            return array.array('d', cached)
+
+        unique_curves = list(set(curves))
+        if len(unique_curves) == len(curves):
+            return array.array('d', cmds.keyframe(curves, query=True, eval=True, time=(time, time)) or [])
+
+        values = dict(zip(unique_curves, cmds.keyframe(unique_curves, query=True, eval=True, time=(time, time)) or []))
+        # a curve driving several plugs is only returned once
+        return array.array('d', [values[curve] for curve in curves])
+
+    @classmethod
+    def capture(cls, objs=None, attrs=None, time=None):
+        '''
+        Capture the selection (or objs) at the current time (or time)
+        '''
+        if objs is None:
+            objs = cmds.ls(selection=True)
+        if time is None:
+            time = cmds.currentTime(query=True)
+
+        plugs, curves = cls.get_channels(objs, attrs)
+        return cls(plugs, curves, cls.evaluate(curves, time))
+
+    @classmethod
+    def neighbours(cls, objs, time, attrs=None):
+        '''
+        Get the (previous key, next key) poses around time. Each curve has its
+        own neighbouring keys, the curves are evaluated once per distinct key time.
+        '''
+        plugs, curves = cls.get_channels(objs, attrs)
+
+        unique_curves = sorted(set(curves))
+        selection_list = om2.MSelectionList()
+        for curve in unique_curves:
+            selection_list.add(curve)
+        curve_fns = dict((curve, om2.MFnAnimCurve(selection_list.getDependNode(n))) for n, curve in enumerate(unique_curves))
+        # the selection list drops repeated curves, so it is indexed by unique curve
+
+        ui_unit = om2.MTime.uiUnit()
+        current = om2.MTime(time, ui_unit)
+        previous_times = {}
+        next_times = {}
+        for i in range(len(curves)):
+            curve_fn = curve_fns[curves[i]]
+            if curve_fn.numKeys < 2:
+                continue
+
+            index = curve_fn.findClosest(current)
+            closest = curve_fn.input(index)
+            previous_index = index if closest < current else index - 1
+            next_index = index if closest > current else index + 1
+            if previous_index < 0 or next_index >= curve_fn.numKeys:
+                continue
+
+            previous_times.setdefault(curve_fn.input(previous_index).asUnits(ui_unit), []).append(i)
+            next_times.setdefault(curve_fn.input(next_index).asUnits(ui_unit), []).append(i)
+
+        channels = sorted(i for indices in previous_times.values() for i in indices)
+        position = dict((channel, n) for n, channel in enumerate(channels))
+
+        poses = []
+        for key_times in (previous_times, next_times):
+            values = array.array('d', [0.0]) * len(channels)
+            for key_time, indices in key_times.items():
+                for i, value in zip(indices, cls.evaluate([curves[i] for i in indices], key_time)):
+                    values[position[i]] = value
+            poses.append(cls([plugs[i] for i in channels], [curves[i] for i in channels], values))
+
+        return poses[0], poses[1]
+
+    def match(self, other):
+        '''
+        Get (this pose, other pose) restricted to the plugs both have, in the same order
+        '''
+        if self.plugs == other.plugs:
+            return self, other
+
+        other_index = dict((plug, i) for i, plug in enumerate(other.plugs))
+        shared = [(i, other_index[plug]) for i, plug in enumerate(self.plugs) if plug in other_index]
+        return (Pose([self.plugs[i] for i, j in shared], [self.curves[i] for i, j in shared], array.array('d', [self.values[i] for i, j in shared])),
+                Pose([other.plugs[j] for i, j in shared], [other.curves[j] for i, j in shared], array.array('d', [other.values[j] for i, j in shared])))
+
+    def blend(self, other, weight):
+        '''
+        Get the pose weight (0-1) of the way from this pose to the other
+        '''
+        pose, other = self.match(other)
+        return Pose(pose.plugs, pose.curves, array.array('d', [a + (b - a) * weight for a, b in zip(pose.values, other.values)]))
+
+    def key_commands(self, time):
+        return ['setKeyframe -time {0!r} -value {1!r} "{2}";'.format(time, value, plug) for plug, value in zip(self.plugs, self.values)]
+
+    def write(self, time=None):
+        '''
+        Key the pose at the current time (or time) with batched setKeyframe calls
+        '''
+        if time is None:
+            time = cmds.currentTime(query=True)
+
+        write_commands(self.key_commands(time), "blendPose")
+
+def write_commands(commands, name):
+    '''
+    Run MEL statements in chunks of BATCH_SIZE as one undo step
+    '''
+    with undo_journal.Transaction(name):
+        for i in range(0, len(commands), BATCH_SIZE):
+            mel.eval("".join(commands[i:i + BATCH_SIZE]))
 
-        difference = nextValue-previousValue
-        weightedDifference = (difference * percentage) / 100.0
-        currentValue = previousValue + weightedDifference
+def blend_range(pose_a, pose_b, start, end, ease=False):
+    '''
+    Key every frame from start to end blending from pose_a to pose_b, all
+    frames in one bulk write
+    '''
+    start, end = int(start), int(end)
+    length = float(max(end - start, 1))
+    pose_a, pose_b = pose_a.match(pose_b)
+
+    commands = []
+    for frame in range(start, end + 1):
+        weight = (frame - start) / length
+        if ease:
+            weight = weight * weight * (3.0 - 2.0 * weight)
+        commands.extend(pose_a.blend(pose_b, weight).key_commands(frame))
+
+    write_commands(commands, "blendRange")
+
+class OverlapOffset(object):
+    '''
+    Overlapping action for a chain of objects: each object's curves are
+    shifted one offset further in time than the previous object's, and
+    optionally scaled down by decay around their mean value. Every curve
+    is edited in one bulk pass.
+    '''
 
-        cmds.setKeyframe(attrFull, time=currentTime, value=currentValue)
+    def __init__(self, objs, offset=1.0, decay=1.0, attrs=None):
+        self.objs = objs
+        self.offset = offset
+        self.decay = decay
+        self.attrs = attrs
+
+    def get_curve_pivot(self, curve_fn):
+        '''
+        Mean key value of the curve in UI units
+        '''
+        count = curve_fn.numKeys
+        mean = sum(curve_fn.value(i) for i in range(count)) / count if count else 0.0
+
+        if curve_fn.animCurveType in (om2.MFnAnimCurve.kAnimCurveTA, om2.MFnAnimCurve.kAnimCurveUA):
+            return om2.MAngle(mean).asUnits(om2.MAngle.uiUnit())
+        if curve_fn.animCurveType in (om2.MFnAnimCurve.kAnimCurveTL, om2.MFnAnimCurve.kAnimCurveUL):
+            return om2.MDistance(mean).asUnits(om2.MDistance.uiUnit())
+        return mean
+
+    def plan(self):
+        '''
+        Get [(obj, curves, time shift, value scale)] for the chain
+        '''
+        steps = []
+        for i, obj in enumerate(self.objs):
+            curves = Pose.get_channels([obj], self.attrs)[1]
+            if curves:
+                steps.append((obj, curves, i * self.offset, self.decay ** i))
+        return steps
+
+    def commands(self):
+        commands = []
+        for obj, curves, shift, scale in self.plan():
+            if scale != 1.0:
+                selection_list = om2.MSelectionList()
+                for curve in curves:
+                    selection_list.add(curve)
+                for i, curve in enumerate(curves):
+                    pivot = self.get_curve_pivot(om2.MFnAnimCurve(selection_list.getDependNode(i)))
+                    commands.append('scaleKey -valueScale {0!r} -valuePivot {1!r} {2};'.format(scale, pivot, curve))
+
+            if shift:
+                commands.append('keyframe -edit -relative -timeChange {0!r} {1};'.format(shift, " ".join(curves)))
+                # one edit moves every curve of the object
+
+        return commands
+
+    def curves(self):
+        return [curve for obj, curves, shift, scale in self.plan() for curve in curves]
+
+    def apply(self):
+        write_commands(self.commands(), "overlapOffset")
+
+class CurveBackup(object):
+    '''
+    Untouched, unconnected copies of anim curves. restore() swaps the copies
+    back in place of the edited curves, whatever was done to them since.
+    '''
+
+    BACKUP_ATTR = "overlapBackup"
+
+    def __init__(self, curves):
+        self.curves = sorted(set(curves))
+        self.copies = cmds.duplicate(self.curves) if self.curves else []
+        for copy in self.copies:
+            cmds.addAttr(copy, longName=self.BACKUP_ATTR, attributeType="bool")
+            # marks the copy as wanted, the scene cleanup keeps curves with user-defined attributes
+
+    def restore(self):
+        for curve, copy in zip(self.curves, self.copies):
+            if not cmds.objExists(curve) or not cmds.objExists(copy):
+                continue
+
+            outputs = cmds.listConnections(curve + ".output", source=False, destination=True, plugs=True) or []
+            inputs = cmds.listConnections(curve + ".input", source=True, destination=False, plugs=True) or []
+            # the plugs it drives and what drives it, e.g. a time warp
+
+            cmds.delete(curve)
+            cmds.deleteAttr(copy, attribute=self.BACKUP_ATTR)
+            copy = cmds.rename(copy, curve)
+            for plug in outputs:
+                cmds.connectAttr(copy + ".output", plug, force=True)
+            for plug in inputs:
+                cmds.connectAttr(plug, copy + ".input", force=True)
+
+        self.copies = []
+
+    def discard(self):
+        copies = [copy for copy in self.copies if cmds.objExists(copy)]
+        if copies:
+            cmds.delete(copies)
+        self.copies = []
+
+class PlaybackMonitor(object):
+    '''
+    Measures playback between start() and stop(): the time between frame
+    changes gives the achieved fps and the slowest frames, which are then
+    re-evaluated node by node (for the history of the given nodes) to rank
+    the slowest nodes. Maya's profiler can record the same playback.
+    '''
 
+    SLOWEST_FRAMES = 5
+    SLOWEST_NODES = 20
+
+    def __init__(self, nodes=None, profile=True):
+        self.nodes = nodes or []
+        self.profile = profile
+        self.callback = None
+        self.frame_times = []
+        # [(frame, seconds since the previous frame change)]
+        self.node_times = {}
+
+    def start(self):
+        self.frame_times = []
+        self.last_change = timeit.default_timer()
+        self.callback = om2.MEventMessage.addEventCallback("timeChanged", self.on_time_changed)
+
+        if self.profile:
+            cmds.profiler(reset=True)
+            cmds.profiler(sampling=True)
+
+    def on_time_changed(self, *args):
+        now = timeit.default_timer()
+        self.frame_times.append((om2.MAnimControl.currentTime().asUnits(om2.MTime.uiUnit()), now - self.last_change))
+        self.last_change = now
+
+    def stop(self, output_dir=None):
+        '''
+        Stop measuring, rank the nodes and write the summary (and profiler
+        recording) to output_dir, the user temp directory by default.
+        Returns the summary.
+        '''
+        if self.callback is not None:
+            om2.MMessage.removeCallback(self.callback)
+            self.callback = None
+
+        output_dir = output_dir or cmds.internalVar(userTmpDir=True)
+        profile_path = None
+        if self.profile:
+            cmds.profiler(sampling=False)
+            profile_path = os.path.join(output_dir, "playback_profile.txt")
+            cmds.profiler(output=profile_path)
+
+        summary = self.summary()
+        summary["slowest_nodes"] = self.time_nodes([frame for frame, seconds in summary["slowest_frames"]])
+        summary["profile"] = profile_path
+
+        with open(os.path.join(output_dir, "playback_summary.json"), "w") as f:
+            json.dump(summary, f, indent=1)
+
+        return summary
+
+    def summary(self):
+        frame_times = self.frame_times[1:]
+        # the first change includes the time before play was pressed
+        total = sum(seconds for frame, seconds in frame_times)
+        target_fps = om2.MTime(1.0, om2.MTime.kSeconds).asUnits(om2.MTime.uiUnit())
+
+        return {"frames": len(frame_times),
+                "fps": len(frame_times) / total if total else 0.0,
+                "target_fps": target_fps,
+                "mean_ms": 1000.0 * total / len(frame_times) if frame_times else 0.0,
+                "slowest_frames": sorted(frame_times, key=lambda frame_time: frame_time[1], reverse=True)[:self.SLOWEST_FRAMES]}
+
+    def time_nodes(self, frames):
+        '''
+        Get [(node, seconds)] for the history of the nodes, slowest first, by
+        dirtying and evaluating each node alone at the given frames
+        '''
+        history = (cmds.listHistory(self.nodes) or []) if self.nodes else []
+        if not history or not frames:
+            return []
+
+        current = cmds.currentTime(query=True)
+        node_times = dict((node, 0.0) for node in history)
+        for frame in frames:
+            cmds.currentTime(frame, edit=True)
+            for node in history:
+                cmds.dgdirty(node)
+                start = timeit.default_timer()
+                cmds.dgeval(node)
+                node_times[node] += timeit.default_timer() - start
+        cmds.currentTime(current, edit=True)
+
+        return sorted(node_times.items(), key=lambda node_time: node_time[1], reverse=True)[:self.SLOWEST_NODES]
+
+    @classmethod
+    def print_summary(cls, summary):
+        print "{0} frames at {1:.1f} fps (target {2:.1f}), {3:.2f} ms per frame".format(summary["frames"], summary["fps"], summary["target_fps"], summary["mean_ms"])
+        for frame, seconds in summary["slowest_frames"]:
+            print "    frame {0:>8.1f}{1:>10.2f} ms".format(frame, seconds * 1000.0)
+        for node, seconds in summary["slowest_nodes"]:
+            print "    {0:<40}{1:>10.3f} ms".format(node, seconds * 1000.0)
+
+        if summary["fps"] < summary["target_fps"] * 0.95:
+            cmds.warning("Playback is not real time: {0:.1f} of {1:.1f} fps".format(summary["fps"], summary["target_fps"]))
 
 def tween(percentage, obj=None, attrs=None, selection=True):
-'''
-Prepare object for tweening
-'''
+    '''
+    Key the objects (the selection by default) percentage of the way from
+    the previous to the next key of each animated attribute
+    '''
 
     if not obj and not selection:
             raise ValueError("No object given to tweet")
 
-    if not obj:
-        obj = get_obj()
-
-    if not attrs:
-        attrs = cmds.listAttr(obj, keyable=True)
-
+    objs = [obj] if obj else cmds.ls(selection=True)
     currentTime = cmds.currentTime(query=True)
 
-    tweenUtils(attrs, obj, currentTime, percentage)
+    previous_pose, next_pose = Pose.neighbours(objs, currentTime, attrs)
+    previous_pose.blend(next_pose, percentage / 100.0).write(currentTime)
 
 class TweenerWindow(object):
-'''
-This class is resposible for the interface of the tool.
-'''
+    '''
+    This class is resposible for the interface of the tool.
+    '''
 
     windowName = "TweenerWindow"
 
     def show(self):
-    '''
-    Initialize basic UI window
-    '''    
+        '''
+        Initialize basic UI window
+        '''
         if cmds.window(self.windowName, query=True, exists=True):
             cmds.deleteUI(self.windowName)
 
-        window = cmds.window(self.windowName, title="Object Tweener", widthHeight=(200, 400))
+        window = cmds.window(self.windowName, title="Object Tweener", widthHeight=(200, 580))
+
+        self.overlap_backup = None
+        self.playback_monitor = None
+
+        clear_attr_cache()
+        cmds.scriptJob(event=["SelectionChanged", clear_attr_cache], parent=self.windowName)
+        # the animated attribute cache only lives as long as the selection
+        self.connection_callback = om2.MDGMessage.addConnectionCallback(on_connection_changed)
+        cmds.scriptJob(uiDeleted=[self.windowName, self.on_close], runOnce=True)
+        # the connection callback and a running playback monitor's timeChanged callback would outlive the window
 
         self.buildUI()
 
         cmds.showWindow()
 
     def buildUI(self):
-    '''
-    Populate window with columns, rows, button, etc.
-    '''
+        '''
+        Populate window with columns, rows, button, etc.
+        '''
 
         column = cmds.columnLayout(adjustableColumn=False, columnAlign="left")
 
@@ -132,17 +565,127 @@ This class is resposible for the interface of the tool.
 
         cmds.setParent( column )
 
+        cmds.frameLayout( label='Pose Blending', collapsable=True, width=200 )
+        cmds.rowColumnLayout( numberOfColumns=2, columnWidth=[(1, 98), (2, 98)], columnSpacing=[(2, 4)] )
+        cmds.button( label='Capture A', command=lambda *args: self.capture_pose('A') )
+        cmds.button( label='Capture B', command=lambda *args: self.capture_pose('B') )
+        cmds.button( label='Blend A-B', command=self.blend_poses )
+        cmds.button( label='Blend Range', command=self.blend_pose_range )
+        self.ease_checkbox = cmds.checkBox( label='Ease range', value=False )
+        # third row(s): poses captured from the selection, blended with the slider percentage
+        # or keyed over the playback range
+
+        cmds.setParent( column )
+
+        cmds.frameLayout( label='Overlap', collapsable=True, width=200 )
+        cmds.rowColumnLayout( numberOfColumns=2, columnWidth=[(1, 98), (2, 98)], columnSpacing=[(2, 4)] )
+        cmds.text( label='Frame offset:' )
+        self.offset_field = cmds.floatField( value=2.0, precision=2 )
+        cmds.text( label='Decay:' )
+        self.decay_field = cmds.floatField( value=1.0, minValue=0.0, maxValue=1.0, precision=2 )
+        cmds.button( label='Preview Overlap', command=self.preview_overlap )
+        cmds.button( label='Commit', command=self.commit_overlap )
+        cmds.button( label='Cancel', command=self.cancel_overlap )
+        # fourth row(s): offsets the selected chain, in selection order, until committed or cancelled
+
+        cmds.setParent( column )
+
+        self.monitor_checkbox = cmds.checkBox( label='Monitor playback', value=False )
+        # measures fps and the slowest nodes of the selection between Play and Stop
+        cmds.button( label='Bake Cache', command=self.bake_cache )
+        # poses and tweens read the selection's values from the cache until its curves are edited
+
     def update_value(self, *args):
-    '''
-    Updates tween value based on percentage slider
-    '''
+        '''
+        Updates tween value based on percentage slider
+        '''
         self.value = cmds.floatSliderGrp(self.tween_slider, q=True, v=True)
         tween(self.value)
 
+    def capture_pose(self, slot):
+        '''
+        Stores the selection's animated values at the current time
+        '''
+        POSES[slot] = Pose.capture()
+
+    def get_captured_poses(self):
+        if 'A' not in POSES or 'B' not in POSES:
+            cmds.warning("Capture pose A and pose B first")
+            return None
+
+        return POSES['A'], POSES['B']
+
+    def blend_poses(self, *args):
+        '''
+        Keys the blend between pose A and B at the slider percentage
+        '''
+        poses = self.get_captured_poses()
+        if poses:
+            percentage = cmds.floatSliderGrp(self.tween_slider, q=True, v=True)
+            poses[0].blend(poses[1], percentage / 100.0).write()
+
+    def blend_pose_range(self, *args):
+        '''
+        Keys every frame of the playback range from pose A to pose B
+        '''
+        poses = self.get_captured_poses()
+        if poses:
+            start = cmds.playbackOptions(q=True, minTime=True)
+            end = cmds.playbackOptions(q=True, maxTime=True)
+            blend_range(poses[0], poses[1], start, end, cmds.checkBox(self.ease_checkbox, q=True, value=True))
+
+    def preview_overlap(self, *args):
+        '''
+        Applies the overlap to the selected chain so it can be played back,
+        replacing the previous preview. The original curves are kept aside
+        until the preview is committed or cancelled.
+        '''
+        chain = cmds.ls(orderedSelection=True) or cmds.ls(selection=True)
+        if len(chain) < 2:
+            cmds.warning("Select the chain of objects, in order")
+            return
+
+        self.cancel_overlap()
+
+        offset = cmds.floatField(self.offset_field, q=True, value=True)
+        decay = cmds.floatField(self.decay_field, q=True, value=True)
+        overlap = OverlapOffset(chain, offset, decay)
+
+        with undo_journal.Transaction("previewOverlap"):
+            self.overlap_backup = CurveBackup(overlap.curves())
+            overlap.apply()
+
+    def commit_overlap(self, *args):
+        '''
+        Keeps the previewed overlap
+        '''
+        if self.overlap_backup:
+            with undo_journal.Transaction("commitOverlap"):
+                self.overlap_backup.discard()
+            self.overlap_backup = None
+
+    def cancel_overlap(self, *args):
+        '''
+        Puts the original curves back in place of the previewed overlap
+        '''
+        if self.overlap_backup:
+            with undo_journal.Transaction("cancelOverlap"):
+                self.overlap_backup.restore()
+            self.overlap_backup = None
+
+    def bake_cache(self, *args):
+        '''
+        Bakes the selection's animation over the playback range
+        '''
+        start = cmds.playbackOptions(q=True, minTime=True)
+        end = cmds.playbackOptions(q=True, maxTime=True)
+        cache = anim_cache.bake(cmds.ls(selection=True), start, end)
+        print "Baked {0} channels over {1} frames".format(len(cache.plugs), cache.frame_count)
+
     def average(self, *args):
-    '''
-    Tweens at an "average" value generated by the left and right points
-    '''
+        '''
+        Tweens at an "average" value generated by the left and right points
+        '''
         currentTime = cmds.currentTime(query=True)
         obj = get_obj(attrs=None, selection=True)
         attrFull = get_attr_full(obj, "translateX")
@@ -166,40 +709,41 @@ This class is resposible for the interface of the tool.
         tween(50)
 
     def open_graph_editor(self, *args):
-    '''
-    Opens the Graph Editor
-    '''
+        '''
+        Opens the Graph Editor
+        '''
         cmds.GraphEditor()
 
     def undo(self, *args):
-    '''
-    Undoes the last command
-    '''
-        cmds.undo()
+        '''
+        Undoes the last command
+        '''
+        undo_journal.undo()
 
     def erase_single_key(self, *args):
-    '''
-    Erases current key
-    '''
+        '''
+        Erases current key
+        '''
         currentTime = cmds.currentTime(query=True)
         cmds.cutKey(get_obj(), time=(currentTime, currentTime+1), attribute="translateX", option="keys")
 
     def erase_keys_range(self, *args):
-    '''
-    Erases all keys in a range
-    '''
+        '''
+        Erases all keys in a range
+        '''
         cmds.cutKey(get_obj(), time=(self.start_time, self.end_time), attribute="translateX", option="keys")
 
     def create_key(self, *args):
-    '''
-    Creates a new key
-    '''
+        '''
+        Creates a new key
+        '''
         cmds.setKeyframe()
+        clear_attr_cache()
 
     def next_key(self, *args):
-    '''
-    Moves forward to the next key, if possible
-    '''
+        '''
+        Moves forward to the next key, if possible
+        '''
         currentTime = cmds.currentTime(query=True)
         obj = get_obj(attrs=None, selection=True)
         attrFull = get_attr_full(obj, "translateX")
@@ -209,9 +753,9 @@ This class is resposible for the interface of the tool.
         cmds.currentTime( next_key_frame, edit=True )
 
     def prev_key(self, *args):
-    '''
-    Moves backwards to the previous key, if possible
-    '''
+        '''
+        Moves backwards to the previous key, if possible
+        '''
         currentTime = cmds.currentTime(query=True)
         obj = get_obj(attrs=None, selection=True)
         attrFull = get_attr_full(obj, "translateX")
@@ -221,23 +765,23 @@ This class is resposible for the interface of the tool.
         cmds.currentTime( prev_key_frame, edit=True )
 
     def store_start_time(self, *args):
-    '''
-    Stores start time
-    '''
+        '''
+        Stores start time
+        '''
         self.start_time = cmds.floatField(self.start, q=True, v=True)
         print self.start_time
 
     def store_end_time(self, *args):
-    '''
-    Stores end time
-    '''
+        '''
+        Stores end time
+        '''
         self.end_time = cmds.floatField(self.end, q=True, v=True)
         print self.end_time
 
     def erase_dialog(self, *args):
-    '''
-    Shows window to specify start and end times for range delete
-    '''
+        '''
+        Shows window to specify start and end times for range delete
+        '''
         window = cmds.window( title="Specify Time Range", widthHeight=(200,100))
 
         cmds.columnLayout(adjustableColumn=True)
@@ -251,15 +795,36 @@ This class is resposible for the interface of the tool.
         cmds.showWindow(window)
 
     def play(self, *args):
-    '''
-    Plays the animation
-    '''
+        '''
+        Plays the animation, measuring it if Monitor playback is checked
+        '''
+        if cmds.checkBox(self.monitor_checkbox, q=True, value=True) and not self.playback_monitor:
+            self.playback_monitor = PlaybackMonitor(cmds.ls(selection=True))
+            self.playback_monitor.start()
+
         cmds.play(forward=True)
 
     def stop(self, *args):
-    '''
-    Stops the animation
-    '''
+        '''
+        Stops the animation and reports the measured playback
+        '''
         cmds.play( state=False )
 
+        if self.playback_monitor:
+            PlaybackMonitor.print_summary(self.playback_monitor.stop())
+            self.playback_monitor = None
+
+    def on_close(self, *args):
+        '''
+        Stops the playback monitor and the cache callback, and keeps any
+        previewed overlap when the window is closed
+        '''
+        self.commit_overlap()
+        if self.connection_callback is not None:
+            om2.MMessage.removeCallback(self.connection_callback)
+            self.connection_callback = None
+        if self.playback_monitor:
+            self.playback_monitor.stop()
+            self.playback_monitor = None
+
 
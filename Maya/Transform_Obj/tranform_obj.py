@@ -1,28 +1,615 @@
 from PySide2 import QtCore
 from PySide2 import QtWidgets
 from PySide2 import QtGui
-from shiboken2 import wrapInstance
+
+import gzip
+import json
+import os
+import sys
+import tempfile
+import timeit
 
 import maya.OpenMaya as om
-import maya.OpenMayaUI as omui
+import maya.api.OpenMaya as om2
 import maya.cmds as cmds
+import maya.mel as mel
+
+SHARED_DIRS = ["Undo_Journal"]
+# folders of the shared modules, next to this tool's folder. The shelf launcher
+# adds them itself, this covers running the file on its own
+if "__file__" in globals():
+    for shared_dir in SHARED_DIRS:
+        shared_path = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), shared_dir)
+        if shared_path not in sys.path:
+            sys.path.append(shared_path)
+    # code pasted into the script editor has no __file__, see the README
+
+import undo_journal
 
 
 def maya_main_window():
     """
-    Return the Maya main window widget as a Python object
+    Return the Maya main window widget as a Python object (None in mayapy)
     """
+    import maya.OpenMayaUI as omui
+    from shiboken2 import wrapInstance
+
     main_window_ptr = omui.MQtUtil.mainWindow()
+    if main_window_ptr is None:
+        return None
     return wrapInstance(long(main_window_ptr), QtWidgets.QWidget)
 
 
+class TransformSnapshot(object):
+    """
+    Names, UUIDs, visibility and TRS of every mesh transform, stored column by column
+    """
+
+    COLUMNS = ["visibility", "tx", "ty", "tz", "rx", "ry", "rz", "sx", "sy", "sz"]
+    PLUGS = ["visibility", "translate", "rotate", "scale"]
+    # the attributes apply writes COLUMNS back to
+    FILE_VERSION = 2
+    BATCH_SIZE = 5000
+    # number of nodes per mel.eval call when applying
+
+    def __init__(self, names=None, columns=None, uuids=None):
+        self.names = names or []
+        self.uuids = uuids or [None] * len(self.names)
+        # version 1 files have no UUIDs
+        self.columns = columns or dict((column, []) for column in self.COLUMNS)
+
+    def __len__(self):
+        return len(self.names)
+
+    def row(self, index):
+        return [self.columns[column][index] for column in self.COLUMNS]
+
+    @classmethod
+    def from_scene(cls):
+        """
+        Read every non-intermediate mesh's transform in one API sweep
+        """
+        selection_list = om2.MSelectionList()
+        for mesh in cmds.ls(type="mesh", noIntermediateObjects=True, long=True) or []:
+            selection_list.add(mesh)
+
+        snapshot = cls()
+        seen = set()
+        for i in range(selection_list.length()):
+            dag_path = selection_list.getDagPath(i)
+            dag_path.pop()
+            name = dag_path.fullPathName()
+            if name in seen:
+                continue
+            seen.add(name)
+
+            transform_fn = om2.MFnTransform(dag_path)
+            snapshot.names.append(name)
+            snapshot.uuids.append(transform_fn.uuid().asString())
+            for column, value in zip(cls.COLUMNS, cls.read_row(transform_fn)):
+                snapshot.columns[column].append(value)
+
+        return snapshot
+
+    @classmethod
+    def read_row(cls, transform_fn):
+        """
+        Values of COLUMNS for one MFnTransform in UI units, the units setAttr takes
+        """
+        translation = transform_fn.translation(om2.MSpace.kTransform)
+        rotation = transform_fn.rotation()
+        scale = transform_fn.scale()
+        visibility = transform_fn.findPlug("visibility", False).asBool()
+
+        distance_unit = om2.MDistance.uiUnit()
+        angle_unit = om2.MAngle.uiUnit()
+        # the API works in centimeters and radians whatever the scene is set to
+
+        return [visibility] + [om2.MDistance(value).asUnits(distance_unit) for value in (translation.x, translation.y, translation.z)] \
+            + [om2.MAngle(value).asUnits(angle_unit) for value in (rotation.x, rotation.y, rotation.z)] \
+            + [scale[0], scale[1], scale[2]]
+
+    def save(self, file_path):
+        data = {"version": self.FILE_VERSION, "names": self.names, "uuids": self.uuids, "columns": self.columns}
+        opener = gzip.open if file_path.endswith(".gz") else open
+        with opener(file_path, "wb") as f:
+            f.write(json.dumps(data, separators=(",", ":")).encode("utf-8"))
+
+    @classmethod
+    def load(cls, file_path):
+        opener = gzip.open if file_path.endswith(".gz") else open
+        with opener(file_path, "rb") as f:
+            data = json.loads(f.read().decode("utf-8"))
+
+        return cls(data["names"], data["columns"], data.get("uuids"))
+
+    def apply(self):
+        """
+        Write the snapshot onto the nodes of the current scene with batched
+        setAttr calls. Nodes that are missing are skipped, nodes are matched
+        by full path first, then by a unique short name.
+        Returns (applied, missing) node counts.
+        """
+        existing = set(cmds.ls(self.names, long=True) or [])
+        by_short_name = None
+
+        nodes = []
+        rows = []
+        missing = 0
+        for i, name in enumerate(self.names):
+            if name not in existing:
+                if by_short_name is None:
+                    by_short_name = {}
+                    for transform in cmds.ls(type="transform", long=True) or []:
+                        by_short_name.setdefault(transform.split("|")[-1], []).append(transform)
+                    # built once, only when some path does not match
+
+                matches = by_short_name.get(name.split("|")[-1], [])
+                if len(matches) != 1:
+                    missing += 1
+                    continue
+                name = matches[0]
+
+            nodes.append(name)
+            rows.append(self.row(i))
+
+        settable, skipped = undo_journal.split_settable(["{0}.{1}".format(node, attr) for node in nodes for attr in self.PLUGS])
+        settable = set(settable)
+
+        commands = []
+        for node, row in zip(nodes, rows):
+            values = [[int(row[0])], row[1:4], row[4:7], row[7:10]]
+            command = "".join('setAttr "{0}.{1}" {2};'.format(node, attr, " ".join(repr(value) for value in attr_values))
+                              for attr, attr_values in zip(self.PLUGS, values) if "{0}.{1}".format(node, attr) in settable)
+            if command:
+                commands.append(command)
+                # only the plugs that can be set, a locked rotate still lets translate through
+
+        with undo_journal.Transaction("applySnapshot"):
+            failed = [command.split('"')[1].rsplit(".", 1)[0] for command in undo_journal.eval_batched(commands, self.BATCH_SIZE)]
+
+        if skipped or failed:
+            om.MGlobal.displayWarning("Skipped {0} locked, connected or referenced attributes and {1} nodes that failed: {2}".format(
+                len(skipped), len(failed), ", ".join((skipped + failed)[:10])))
+
+        return len(commands) - len(failed), missing
+
+
+class SnapshotDiff(object):
+    """
+    Differences between two snapshots, found through hash lookups only so the
+    cost grows linearly with the node count.
+
+    Nodes are paired by UUID, then by name, then (for the leftovers) by
+    identical transform values when exactly one old and one new node have
+    them. A pair with different names is renamed, a pair whose TRS values
+    differ by more than the tolerance is moved, a pair whose visibility
+    differs is toggled.
+    """
+
+    def __init__(self, old, new, tolerance=0.0001):
+        self.old = old
+        self.new = new
+        self.tolerance = tolerance
+
+        self.added = []
+        # new snapshot indices
+        self.removed = []
+        # old snapshot indices
+        self.renamed = []
+        # (old index, new index)
+        self.moved = []
+        # (old index, new index, largest TRS value change)
+        self.toggled = []
+        # (old index, new index) whose visibility changed
+
+        self.compute()
+
+    def value_key(self, snapshot, index):
+        return tuple(int(round(value / self.tolerance)) for value in snapshot.row(index)[1:])
+        # TRS only, visibility is the first column
+
+    def compute(self):
+        old_by_uuid = dict((uuid, i) for i, uuid in enumerate(self.old.uuids) if uuid)
+        old_by_name = dict((name, i) for i, name in enumerate(self.old.names))
+
+        pairs = []
+        matched_old = set()
+        unmatched_new = []
+        for j in range(len(self.new)):
+            i = old_by_uuid.get(self.new.uuids[j])
+            if i is None or i in matched_old:
+                i = old_by_name.get(self.new.names[j])
+            if i is None or i in matched_old:
+                unmatched_new.append(j)
+                continue
+
+            matched_old.add(i)
+            pairs.append((i, j))
+
+        old_by_values = {}
+        for i in range(len(self.old)):
+            if i not in matched_old:
+                old_by_values.setdefault(self.value_key(self.old, i), []).append(i)
+        new_by_values = {}
+        for j in unmatched_new:
+            new_by_values.setdefault(self.value_key(self.new, j), []).append(j)
+
+        for j in unmatched_new:
+            key = self.value_key(self.new, j)
+            candidates = old_by_values.get(key, [])
+            if len(candidates) == 1 and len(new_by_values[key]) == 1:
+                i = candidates[0]
+                matched_old.add(i)
+                pairs.append((i, j))
+                # several nodes sharing values (e.g. props frozen at the origin) would be guesses
+            else:
+                self.added.append(j)
+
+        self.removed = [i for i in range(len(self.old)) if i not in matched_old]
+
+        for i, j in pairs:
+            if self.old.names[i] != self.new.names[j]:
+                self.renamed.append((i, j))
+
+            old_row = self.old.row(i)
+            new_row = self.new.row(j)
+            change = max(abs(a - b) for a, b in zip(old_row[1:], new_row[1:]))
+            if change > self.tolerance:
+                self.moved.append((i, j, change))
+            if bool(old_row[0]) != bool(new_row[0]):
+                self.toggled.append((i, j))
+
+    def summary(self):
+        return "{0} added, {1} removed, {2} renamed, {3} moved, {4} shown or hidden".format(
+            len(self.added), len(self.removed), len(self.renamed), len(self.moved), len(self.toggled))
+
+
+class SceneCleanup(object):
+    """
+    Finds nodes nothing depends on (animation curves driving nothing, empty
+    groups, shading groups without members and materials without a used
+    shading group) with a few bulk connection queries, then deletes them in
+    batches ordered so dependents go before what they depend on
+    """
+
+    BATCH_SIZE = 5000
+    # number of nodes per mel.eval call
+
+    DEFAULT_SHADING = ["initialShadingGroup", "initialParticleSE", "lambert1", "standardSurface1", "particleCloud1", "shaderGlow1"]
+
+    @classmethod
+    def find_orphan_curves(cls):
+        curves = cmds.ls(type="animCurve") or []
+        if not curves:
+            return []
+
+        connections = cmds.listConnections(curves, source=False, destination=True, connections=True, plugs=True) or []
+        used = set(plug.split(".")[0] for plug in connections[0::2])
+
+        return [curve for curve in curves if curve not in used and not cmds.listAttr(curve, userDefined=True)]
+        # curves with their own attributes are kept on purpose, e.g. the tweener's overlap backups
+
+    @classmethod
+    def find_unused_shading(cls):
+        """
+        Returns (shading groups, materials)
+        """
+        shading_groups = [node for node in cmds.ls(type="shadingEngine") or [] if node not in cls.DEFAULT_SHADING]
+        members = cmds.listConnections(["{0}.dagSetMembers".format(node) for node in shading_groups],
+                                       source=True, destination=False, connections=True, plugs=True) if shading_groups else []
+        used_groups = set(plug.split(".")[0] for plug in (members or [])[0::2])
+        unused_groups = [node for node in shading_groups if node not in used_groups]
+
+        materials = [node for node in cmds.ls(materials=True) or [] if node not in cls.DEFAULT_SHADING]
+        kept_groups = list(used_groups) + (cmds.ls(cls.DEFAULT_SHADING, type="shadingEngine") or [])
+        used_materials = set(cmds.ls(cmds.listHistory(kept_groups) or [], materials=True) or []) if materials and kept_groups else set()
+        # one history walk also finds materials feeding a used group through other nodes, e.g. a layered shader
+        unused_materials = [node for node in materials if node not in used_materials]
+
+        return unused_groups, unused_materials
+
+    @classmethod
+    def find_empty_groups(cls):
+        """
+        Unconnected transforms whose children are all empty groups, deepest
+        first. Groups that look intentional are kept: referenced ones, ones
+        with user-defined attributes and ones that are moved, rotated or scaled.
+        """
+        identity = om2.MMatrix()
+        paths = []
+        dag_iter = om2.MItDag(om2.MItDag.kDepthFirst, om2.MFn.kTransform)
+        while not dag_iter.isDone():
+            paths.append(dag_iter.getPath())
+            dag_iter.next()
+
+        empty = set()
+        groups = []
+        for dag_path in reversed(paths):
+            # children are visited after their parent, so reversed they come first
+            name = dag_path.fullPathName()
+            dag_fn = om2.MFnDagNode(dag_path)
+            if dag_path.apiType() != om2.MFn.kTransform or dag_fn.getConnections() or dag_fn.isFromReferencedFile:
+                continue
+            if not dag_fn.transformationMatrix().isEquivalent(identity):
+                continue
+                # placeholders in rigs and layouts are often positioned
+
+            children = [dag_path.child(i) for i in range(dag_path.childCount())]
+            if all(om2.MFnDagNode(child).fullPathName() in empty for child in children) and not cmds.listAttr(name, userDefined=True):
+                empty.add(name)
+                groups.append(name)
+
+        return groups
+
+    @classmethod
+    def plan(cls):
+        """
+        Batches to delete, in order: shading groups before their materials,
+        curves, then the top-most empty groups
+        """
+        unused_groups, unused_materials = cls.find_unused_shading()
+        batches = [("shading groups", unused_groups), ("materials", unused_materials),
+                   ("animation curves", cls.find_orphan_curves()), ("empty groups", cls.find_empty_groups())]
+
+        protected = set()
+        nodes = [node for label, batch in batches for node in batch]
+        if nodes:
+            protected.update(cmds.ls(nodes, readOnly=True, long=True) or [])
+            protected.update(cmds.ls(nodes, undeletable=True, long=True) or [])
+            # referenced and default nodes cannot be deleted
+
+        return [(label, [node for node in batch if node not in protected]) for label, batch in batches]
+
+    @classmethod
+    def delete(cls, batches):
+        commands = []
+        for label, batch in batches:
+            listed = set(batch)
+            batch = [node for node in batch if node.rpartition("|")[0] not in listed]
+            # a group whose parent is also deleted goes with it
+            commands.extend("delete {0};".format(" ".join(batch[i:i + cls.BATCH_SIZE])) for i in range(0, len(batch), cls.BATCH_SIZE))
+
+        with undo_journal.Transaction("cleanScene"):
+            for command in commands:
+                mel.eval(command)
+
+    @classmethod
+    def time_save(cls):
+        """
+        Seconds taken to write the scene to a temporary mayaBinary file
+        """
+        handle, file_path = tempfile.mkstemp(suffix=".mb")
+        os.close(handle)
+
+        start = timeit.default_timer()
+        cmds.file(file_path, exportAll=True, type="mayaBinary", force=True, preserveReferences=True)
+        elapsed = timeit.default_timer() - start
+
+        os.remove(file_path)
+        return elapsed
+
+    @classmethod
+    def run(cls, measure_save=False, confirm=None):
+        """
+        Returns {"removed": {label: count}, "seconds": cleanup time, "save_before"/"save_after": seconds or None}.
+        measure_save exports the whole scene twice, so it is off unless asked for.
+        confirm(batches) is shown the planned deletions and returns False to
+        cancel, run then returns None.
+        """
+        start = timeit.default_timer()
+        batches = cls.plan()
+        plan_seconds = timeit.default_timer() - start
+
+        if confirm and not confirm(batches):
+            return None
+
+        save_before = cls.time_save() if measure_save else None
+
+        start = timeit.default_timer()
+        cls.delete(batches)
+        seconds = plan_seconds + timeit.default_timer() - start
+
+        save_after = cls.time_save() if measure_save else None
+
+        report = {"removed": dict((label, len(batch)) for label, batch in batches), "seconds": seconds,
+                  "save_before": save_before, "save_after": save_after}
+        cls.print_report(report)
+
+        return report
+
+    @classmethod
+    def print_report(cls, report):
+        for label, count in report["removed"].items():
+            print("{0:<20}{1:>8}".format(label, count))
+
+        message = "Removed {0} nodes in {1:.2f}s".format(sum(report["removed"].values()), report["seconds"])
+        if report["save_before"] is not None:
+            message += ", saving went from {0:.2f}s to {1:.2f}s".format(report["save_before"], report["save_after"])
+        om.MGlobal.displayInfo(message)
+
+
+class BulkVisibility(object):
+    """
+    Shows, hides or inverts many transforms at once: through batched setAttr
+    calls, by moving them into a hidden display layer, or by isolating them
+    in the viewport. None of these go through the table rows one by one.
+    """
+
+    SCOPES = ["Filter", "Selection", "All"]
+    LAYER_NAME = "transformTableHidden"
+    BATCH_SIZE = 5000
+    # number of nodes per mel.eval call
+
+    previous_layers = {}
+    # node uuid -> display layer it was in before hide_with_layer
+
+    @classmethod
+    def get_nodes(cls, scope, pattern=""):
+        if scope == "Selection":
+            return cmds.ls(selection=True, type="transform", long=True) or []
+
+        if scope == "Filter":
+            return cmds.ls(pattern or "*", type="transform", long=True) or []
+
+        meshes = cmds.ls(type="mesh", noIntermediateObjects=True, long=True) or []
+        return sorted(set(cmds.listRelatives(meshes, parent=True, fullPath=True) or [])) if meshes else []
+
+    @classmethod
+    def get_visibility(cls, nodes):
+        """
+        {node: visibility} read in one API pass
+        """
+        selection_list = om2.MSelectionList()
+        for node in nodes:
+            selection_list.add(node)
+
+        visibility = {}
+        for i in range(selection_list.length()):
+            dag_path = selection_list.getDagPath(i)
+            visibility[dag_path.fullPathName()] = om2.MFnDagNode(dag_path).findPlug("visibility", False).asBool()
+
+        return visibility
+
+    @classmethod
+    def set_visibility(cls, visibility):
+        """
+        visibility is {node: bool}, written with batched setAttr calls in one undo step.
+        Locked, driven or referenced visibility plugs are skipped and reported
+        """
+        settable, skipped = undo_journal.split_settable(["{0}.visibility".format(node) for node in visibility])
+        commands = ['setAttr "{0}" {1};'.format(plug, int(visibility[plug.rsplit(".", 1)[0]])) for plug in settable]
+
+        with undo_journal.Transaction("setVisibility"):
+            skipped.extend(command.split('"')[1] for command in undo_journal.eval_batched(commands, cls.BATCH_SIZE))
+
+        if skipped:
+            om.MGlobal.displayWarning("Skipped {0} locked, connected or referenced visibility attributes: {1}".format(
+                len(skipped), ", ".join(skipped[:10])))
+
+    @classmethod
+    def show(cls, nodes):
+        cls.set_visibility(dict((node, True) for node in nodes))
+
+    @classmethod
+    def hide(cls, nodes):
+        cls.set_visibility(dict((node, False) for node in nodes))
+
+    @classmethod
+    def invert(cls, nodes):
+        cls.set_visibility(dict((node, not visible) for node, visible in cls.get_visibility(nodes).items()))
+
+    @classmethod
+    def hide_with_layer(cls, nodes):
+        """
+        One membership edit instead of an attribute edit per node. The layer
+        each node was in is remembered so show_with_layer can put it back
+        """
+        layers = cls.get_layers(nodes)
+        for node, uuid in zip(nodes, cmds.ls(nodes, uuid=True) or []):
+            if layers.get(node) != cls.LAYER_NAME:
+                cls.previous_layers[uuid] = layers.get(node, "defaultLayer")
+
+        with undo_journal.Transaction("hideWithLayer"):
+            if cmds.objExists(cls.LAYER_NAME):
+                cmds.editDisplayLayerMembers(cls.LAYER_NAME, nodes, noRecurse=True)
+            else:
+                cmds.createDisplayLayer(nodes, name=cls.LAYER_NAME, noRecurse=True)
+            cmds.setAttr("{0}.visibility".format(cls.LAYER_NAME), False)
+
+    @classmethod
+    def show_with_layer(cls, nodes):
+        """
+        Moves the nodes that are in the hidden layer back to the layers they came from
+        """
+        if not cmds.objExists(cls.LAYER_NAME):
+            return
+
+        members = set(cmds.ls(cmds.editDisplayLayerMembers(cls.LAYER_NAME, query=True, fullNames=True) or [], long=True) or [])
+        nodes = [node for node in cmds.ls(nodes, long=True) or [] if node in members]
+        if not nodes:
+            return
+
+        by_layer = {}
+        for node, uuid in zip(nodes, cmds.ls(nodes, uuid=True)):
+            layer = cls.previous_layers.pop(uuid, "defaultLayer")
+            if not cmds.objExists(layer):
+                layer = "defaultLayer"
+            by_layer.setdefault(layer, []).append(node)
+
+        with undo_journal.Transaction("showWithLayer"):
+            for layer, layer_nodes in by_layer.items():
+                cmds.editDisplayLayerMembers(layer, layer_nodes, noRecurse=True)
+            if not cmds.editDisplayLayerMembers(cls.LAYER_NAME, query=True):
+                cmds.delete(cls.LAYER_NAME)
+
+    @classmethod
+    def get_layers(cls, nodes):
+        """
+        {node: display layer} read in one API pass, nodes in no layer are left out
+        """
+        layers = {}
+        for node in nodes:
+            selection_list = om2.MSelectionList()
+            selection_list.add(node)
+            source = om2.MFnDependencyNode(selection_list.getDependNode(0)).findPlug("drawOverride", False).source()
+            if not source.isNull and source.node().hasFn(om2.MFn.kDisplayLayer):
+                layers[node] = om2.MFnDependencyNode(source.node()).name()
+
+        return layers
+
+    @classmethod
+    def isolate(cls, nodes):
+        """
+        Show only the nodes in the focused viewport, no attributes are edited
+        """
+        panels = [cmds.getPanel(withFocus=True)] + (cmds.getPanel(visiblePanels=True) or [])
+        panels = [panel for panel in panels if panel and cmds.getPanel(typeOf=panel) == "modelPanel"]
+        if not panels:
+            om.MGlobal.displayError("No viewport to isolate in")
+            return
+
+        selection = cmds.ls(selection=True, long=True)
+        cmds.select(nodes, replace=True)
+        cmds.isolateSelect(panels[0], state=False)
+        cmds.isolateSelect(panels[0], state=True)
+        # isolation starts from the current selection
+        if selection:
+            cmds.select(selection, replace=True)
+        else:
+            cmds.select(clear=True)
+
+
 class TransformTableDialog(QtWidgets.QDialog):
 
     #UserRole is integer value (0x0100) and is used as starting index for user defined data
     ATTR_ROLE = QtCore.Qt.UserRole
     VALUE_ROLE = QtCore.Qt.UserRole + 1
+    NODE_ROLE = QtCore.Qt.UserRole + 2
+    # tree items keep the node's UUID, paths change when a parent is renamed
+
+    HEADER_LABELS = ["", "Name", "TransX", "TransY", "TransZ", "RotateX", "RotateY", "RotateZ", "ScaleX", "ScaleY", "ScaleZ"]
+
+    SNAPSHOT_FILTERS = "Transform Snapshot (*.json *.json.gz)"
+
+    DIFF_COLORS = {"added": (70, 130, 70), "removed": (140, 60, 60), "renamed": (60, 90, 140), "moved": (140, 120, 50), "toggled": (100, 100, 100)}
 
-    def __init__(self, parent=maya_main_window()):
+    dlg_instance = None
+
+    @classmethod
+    def show_dialog(cls):
+        if not cls.dlg_instance:
+            cls.dlg_instance = cls()
+
+        if cls.dlg_instance.isHidden():
+            cls.dlg_instance.show()
+        else:
+            cls.dlg_instance.raise_()
+            cls.dlg_instance.activateWindow()
+
+    def __init__(self, parent=None):
+        if parent is None:
+            parent = maya_main_window()
         super(TransformTableDialog, self).__init__(parent)
 
         self.setWindowTitle("Transform Object Table")
@@ -46,14 +633,42 @@ class TransformTableDialog(QtWidgets.QDialog):
         self.table_wdg.setColumnWidth(8,70)
         self.table_wdg.setColumnWidth(9,70)
         self.table_wdg.setColumnWidth(10,70)
-        self.table_wdg.setHorizontalHeaderLabels(["", "Name", "TransX", "TransY", "TransZ", "RotateX", "RotateY", "RotateZ", "ScaleX", "ScaleY", "ScaleZ"])
+        self.table_wdg.setHorizontalHeaderLabels(self.HEADER_LABELS)
         header_view = self.table_wdg.horizontalHeader()
         header_view.setSectionResizeMode(1, QtWidgets.QHeaderView.Stretch)
 
+        self.tree_wdg = QtWidgets.QTreeWidget()
+        self.tree_wdg.setColumnCount(11)
+        self.tree_wdg.setHeaderLabels(self.HEADER_LABELS)
+        self.tree_wdg.setColumnWidth(0, 60)
+        self.tree_wdg.setColumnWidth(1, 180)
+        for column in range(2, 11):
+            self.tree_wdg.setColumnWidth(column, 70)
+        self.tree_wdg.setUniformRowHeights(True)
+
+        self.view_tabs = QtWidgets.QTabWidget()
+        self.view_tabs.addTab(self.tree_wdg, "Hierarchy")
+        self.view_tabs.addTab(self.table_wdg, "Meshes")
+
+        self.visibility_filter_le = QtWidgets.QLineEdit()
+        self.visibility_filter_le.setPlaceholderText("Filter, e.g. *_geo")
+        self.visibility_scope_cmb = QtWidgets.QComboBox()
+        self.visibility_scope_cmb.addItems(BulkVisibility.SCOPES)
+        self.use_layer_cb = QtWidgets.QCheckBox("Display Layer")
+        self.show_btn = QtWidgets.QPushButton("Show")
+        self.hide_btn = QtWidgets.QPushButton("Hide")
+        self.invert_btn = QtWidgets.QPushButton("Invert")
+        self.isolate_btn = QtWidgets.QPushButton("Isolate")
+
         self.file_name_le = QtWidgets.QLineEdit("file name")
         self.save_scene_btn = QtWidgets.QPushButton("Save Scene")
-        self.clear_btn = QtWidgets.QPushButton("Clear Scene")
+        self.clean_btn = QtWidgets.QPushButton("Clean Scene")
+        self.time_save_cb = QtWidgets.QCheckBox("Time Save")
+        self.time_save_cb.setToolTip("Export the scene before and after cleaning to compare save times")
         self.refresh_btn = QtWidgets.QPushButton("Refresh")
+        self.export_btn = QtWidgets.QPushButton("Export Snapshot")
+        self.import_btn = QtWidgets.QPushButton("Apply Snapshot")
+        self.compare_btn = QtWidgets.QPushButton("Compare Snapshot")
         self.close_btn = QtWidgets.QPushButton("Close")
 
     def create_layout(self):
@@ -62,23 +677,49 @@ class TransformTableDialog(QtWidgets.QDialog):
         button_layout.addStretch()
         button_layout.addWidget(self.file_name_le)
         button_layout.addWidget(self.save_scene_btn)
-        button_layout.addWidget(self.clear_btn)
+        button_layout.addWidget(self.clean_btn)
+        button_layout.addWidget(self.time_save_cb)
         button_layout.addWidget(self.refresh_btn)
+        button_layout.addWidget(self.export_btn)
+        button_layout.addWidget(self.import_btn)
+        button_layout.addWidget(self.compare_btn)
         button_layout.addWidget(self.close_btn)
 
+        visibility_layout = QtWidgets.QHBoxLayout()
+        visibility_layout.setSpacing(2)
+        visibility_layout.addWidget(self.visibility_filter_le)
+        visibility_layout.addWidget(self.visibility_scope_cmb)
+        visibility_layout.addWidget(self.use_layer_cb)
+        visibility_layout.addWidget(self.show_btn)
+        visibility_layout.addWidget(self.hide_btn)
+        visibility_layout.addWidget(self.invert_btn)
+        visibility_layout.addWidget(self.isolate_btn)
+
         main_layout = QtWidgets.QVBoxLayout(self)
         main_layout.setContentsMargins(2, 2, 2, 2)
         main_layout.setSpacing(2)
-        main_layout.addWidget(self.table_wdg)
+        main_layout.addWidget(self.view_tabs)
         main_layout.addStretch()
+        main_layout.addLayout(visibility_layout)
         main_layout.addLayout(button_layout)
 
     def create_connections(self):
         self.set_cell_changed_connection_enabled(True)
+        self.set_tree_changed_connection_enabled(True)
+        self.tree_wdg.itemExpanded.connect(self.on_tree_item_expanded)
+        self.view_tabs.currentChanged.connect(self.refresh)
+
+        self.show_btn.clicked.connect(self.show_nodes)
+        self.hide_btn.clicked.connect(self.hide_nodes)
+        self.invert_btn.clicked.connect(self.invert_nodes)
+        self.isolate_btn.clicked.connect(self.isolate_nodes)
 
         self.save_scene_btn.clicked.connect(self.save_scene)
-        self.clear_btn.clicked.connect(self.clear_scene)
-        self.refresh_btn.clicked.connect(self.refresh_table)
+        self.clean_btn.clicked.connect(self.clean_scene)
+        self.refresh_btn.clicked.connect(self.refresh)
+        self.export_btn.clicked.connect(self.export_snapshot)
+        self.import_btn.clicked.connect(self.apply_snapshot)
+        self.compare_btn.clicked.connect(self.compare_snapshot)
         self.close_btn.clicked.connect(self.close)
 
     def set_cell_changed_connection_enabled(self, enabled):
@@ -87,24 +728,312 @@ class TransformTableDialog(QtWidgets.QDialog):
         else:
             self.table_wdg.cellChanged.disconnect(self.on_cell_changed)
 
+    def set_tree_changed_connection_enabled(self, enabled):
+        if enabled:
+            self.tree_wdg.itemChanged.connect(self.on_tree_item_changed)
+        else:
+            self.tree_wdg.itemChanged.disconnect(self.on_tree_item_changed)
+
     def save_scene(self):
         file_name = self.file_name_le.text()
 
         cmds.file( rename=file_name )
         cmds.file( save=True, force=True, type='mayaAscii' )
 
-    def clear_scene(self):
-        cmds.select(all=True)
-        cmds.delete()
+    def clean_scene(self):
+        if SceneCleanup.run(measure_save=self.time_save_cb.isChecked(), confirm=self.confirm_cleanup) is not None:
+            self.refresh()
+
+    def confirm_cleanup(self, batches):
+        """
+        List what the cleanup would delete and ask before deleting it
+        """
+        nodes = [(label, node) for label, batch in batches for node in batch]
+        if not nodes:
+            om.MGlobal.displayInfo("Nothing to clean up")
+            return False
+
+        message_box = QtWidgets.QMessageBox(QtWidgets.QMessageBox.Question, "Clean Scene",
+                                            "Delete {0}?".format(", ".join("{0} {1}".format(len(batch), label) for label, batch in batches if batch)),
+                                            QtWidgets.QMessageBox.Yes | QtWidgets.QMessageBox.No, self)
+        message_box.setDetailedText("\n".join("{0}: {1}".format(label, node) for label, node in nodes))
+        return message_box.exec_() == QtWidgets.QMessageBox.Yes
+
+    def get_visibility_nodes(self):
+        nodes = BulkVisibility.get_nodes(self.visibility_scope_cmb.currentText(), self.visibility_filter_le.text())
+        if not nodes:
+            om.MGlobal.displayWarning("No transforms match")
+        return nodes
+
+    def show_nodes(self):
+        nodes = self.get_visibility_nodes()
+        if nodes:
+            if self.use_layer_cb.isChecked():
+                BulkVisibility.show_with_layer(nodes)
+            else:
+                BulkVisibility.show(nodes)
+            self.sync_visibility()
+
+    def hide_nodes(self):
+        nodes = self.get_visibility_nodes()
+        if nodes:
+            if self.use_layer_cb.isChecked():
+                BulkVisibility.hide_with_layer(nodes)
+            else:
+                BulkVisibility.hide(nodes)
+            self.sync_visibility()
+
+    def invert_nodes(self):
+        nodes = self.get_visibility_nodes()
+        if nodes:
+            BulkVisibility.invert(nodes)
+            self.sync_visibility()
+
+    def isolate_nodes(self):
+        nodes = self.get_visibility_nodes()
+        if nodes:
+            BulkVisibility.isolate(nodes)
+
+    def sync_visibility(self):
+        """
+        Update the visibility checkboxes of the rows on display from one API read
+        instead of refilling the view
+        """
+        if self.view_tabs.currentWidget() is self.tree_wdg:
+            items = []
+            iterator = QtWidgets.QTreeWidgetItemIterator(self.tree_wdg)
+            while iterator.value():
+                items.append((iterator.value(), self.get_tree_item_node(iterator.value())))
+                iterator += 1
+        else:
+            items = [(self.table_wdg.item(row, 0), self.table_wdg.item(row, 1).data(self.VALUE_ROLE)) for row in range(self.table_wdg.rowCount())]
+
+        self.set_cell_changed_connection_enabled(False)
+        self.set_tree_changed_connection_enabled(False)
+        for item, node in items:
+            try:
+                selection_list = om2.MSelectionList()
+                selection_list.add(node)
+                visible = om2.MFnDagNode(selection_list.getDagPath(0)).findPlug("visibility", False).asBool()
+            except (RuntimeError, TypeError):
+                continue
+                # deleted nodes and diff rows
+
+            state = QtCore.Qt.Checked if visible else QtCore.Qt.Unchecked
+            if isinstance(item, QtWidgets.QTreeWidgetItem):
+                item.setCheckState(0, state)
+                item.setData(0, self.VALUE_ROLE, visible)
+            else:
+                item.setCheckState(state)
+                item.setData(self.VALUE_ROLE, visible)
+        self.set_tree_changed_connection_enabled(True)
+        self.set_cell_changed_connection_enabled(True)
+
+    def export_snapshot(self):
+        file_path, selected_filter = QtWidgets.QFileDialog.getSaveFileName(self, "Export Snapshot", "", self.SNAPSHOT_FILTERS)
+        if not file_path:
+            return
+
+        snapshot = TransformSnapshot.from_scene()
+        snapshot.save(file_path)
+        om.MGlobal.displayInfo("Exported {0} transforms to {1}".format(len(snapshot), file_path))
+
+    def apply_snapshot(self):
+        file_path, selected_filter = QtWidgets.QFileDialog.getOpenFileName(self, "Apply Snapshot", "", self.SNAPSHOT_FILTERS)
+        if not file_path:
+            return
+
+        applied, missing = TransformSnapshot.load(file_path).apply()
+        om.MGlobal.displayInfo("Applied {0} transforms, {1} not found in the scene".format(applied, missing))
+
+        self.refresh()
+
+    def compare_snapshot(self):
+        """
+        Two files are compared with each other, a single file with the current scene
+        """
+        file_paths, selected_filter = QtWidgets.QFileDialog.getOpenFileNames(self, "Compare Snapshot", "", self.SNAPSHOT_FILTERS)
+        if not file_paths:
+            return
+
+        if len(file_paths) > 2:
+            om.MGlobal.displayError("Select one snapshot to compare with the scene, or two to compare with each other")
+            return
+
+        old = TransformSnapshot.load(file_paths[0])
+        if len(file_paths) == 2:
+            new = TransformSnapshot.load(file_paths[1])
+        else:
+            new = TransformSnapshot.from_scene()
+
+        diff = SnapshotDiff(old, new)
+        self.view_tabs.setCurrentWidget(self.table_wdg)
+        self.show_diff(diff)
+        om.MGlobal.displayInfo(diff.summary())
+
+    def show_diff(self, diff):
+        """
+        Fill the table with the changed rows only, Refresh goes back to the scene
+        """
+        self.set_cell_changed_connection_enabled(False)
+
+        self.table_wdg.setRowCount(0)
+
+        rows = [("added", diff.new, j, diff.new.names[j]) for j in diff.added]
+        rows += [("removed", diff.old, i, diff.old.names[i]) for i in diff.removed]
+        rows += [("renamed", diff.new, j, "{0} -> {1}".format(diff.old.names[i], diff.new.names[j])) for i, j in diff.renamed]
+        rows += [("moved", diff.new, j, diff.new.names[j]) for i, j, change in diff.moved]
+        rows += [("toggled", diff.new, j, diff.new.names[j]) for i, j in diff.toggled]
+
+        self.table_wdg.setRowCount(len(rows))
+        for row, (status, snapshot, index, name) in enumerate(rows):
+            values = snapshot.row(index)
+            self.insert_item(row, 0, "", "visibility", bool(values[0]), True)
+            self.insert_item(row, 1, name, None, name, False)
+            for column in range(1, len(values)):
+                self.insert_item(row, column + 1, self.float_to_string(values[column]), snapshot.COLUMNS[column], values[column], False)
+
+            color = QtGui.QColor(*self.DIFF_COLORS[status])
+            for column in range(self.table_wdg.columnCount()):
+                item = self.table_wdg.item(row, column)
+                item.setBackground(color)
+                item.setToolTip(status)
+                item.setFlags(item.flags() & ~QtCore.Qt.ItemIsEditable & ~QtCore.Qt.ItemIsUserCheckable)
+                # the diff is a report, edits only make sense on the live table
+
+        self.set_cell_changed_connection_enabled(True)
 
     def showEvent(self, e):
         super(TransformTableDialog, self).showEvent(e)
-        self.refresh_table()
+        self.refresh()
 
     def keyPressEvent(self, e):
         super(TransformTableDialog, self).keyPressEvent(e)
         e.accept()
 
+    def refresh(self, *args):
+        """
+        Only the visible view is refilled
+        """
+        if self.view_tabs.currentWidget() is self.tree_wdg:
+            self.refresh_tree()
+        else:
+            self.refresh_table()
+
+    def refresh_tree(self):
+        """
+        Only the top level of the DAG is read, children are added when their parent is expanded
+        """
+        self.set_tree_changed_connection_enabled(False)
+
+        self.tree_wdg.clear()
+        self.tree_wdg.addTopLevelItems(self.create_tree_items(cmds.ls(assemblies=True, long=True) or []))
+
+        self.set_tree_changed_connection_enabled(True)
+
+    def create_tree_items(self, nodes):
+        selection_list = om2.MSelectionList()
+        for node in nodes:
+            selection_list.add(node)
+
+        items = []
+        for i in range(selection_list.length()):
+            dag_path = selection_list.getDagPath(i)
+            if not dag_path.hasFn(om2.MFn.kTransform):
+                continue
+            items.append(self.create_tree_item(dag_path))
+
+        return items
+
+    def create_tree_item(self, dag_path):
+        transform_fn = om2.MFnTransform(dag_path)
+        values = TransformSnapshot.read_row(transform_fn)
+
+        item = QtWidgets.QTreeWidgetItem()
+        item.setFlags(QtCore.Qt.ItemIsEnabled | QtCore.Qt.ItemIsSelectable | QtCore.Qt.ItemIsEditable | QtCore.Qt.ItemIsUserCheckable)
+        item.setData(1, self.NODE_ROLE, transform_fn.uuid().asString())
+
+        item.setCheckState(0, QtCore.Qt.Checked if values[0] else QtCore.Qt.Unchecked)
+        item.setData(0, self.VALUE_ROLE, values[0])
+        item.setText(1, transform_fn.name())
+        item.setData(1, self.VALUE_ROLE, transform_fn.name())
+        for column in range(1, len(values)):
+            item.setText(column + 1, self.float_to_string(values[column]))
+            item.setData(column + 1, self.VALUE_ROLE, values[column])
+
+        if any(dag_path.child(i).hasFn(om2.MFn.kTransform) for i in range(dag_path.childCount())):
+            item.setChildIndicatorPolicy(QtWidgets.QTreeWidgetItem.ShowIndicator)
+            # children are only read once the branch is expanded
+        else:
+            item.setChildIndicatorPolicy(QtWidgets.QTreeWidgetItem.DontShowIndicator)
+
+        return item
+
+    def on_tree_item_expanded(self, item):
+        if item.childCount() or item.childIndicatorPolicy() != QtWidgets.QTreeWidgetItem.ShowIndicator:
+            return
+
+        node = self.get_tree_item_node(item)
+        if not node:
+            return
+
+        self.set_tree_changed_connection_enabled(False)
+        children = cmds.listRelatives(node, children=True, type="transform", fullPath=True) or []
+        item.addChildren(self.create_tree_items(children))
+        if not item.childCount():
+            item.setChildIndicatorPolicy(QtWidgets.QTreeWidgetItem.DontShowIndicator)
+        self.set_tree_changed_connection_enabled(True)
+
+    def get_tree_item_node(self, item):
+        nodes = cmds.ls(item.data(1, self.NODE_ROLE), long=True)
+        return nodes[0] if nodes else None
+
+    def on_tree_item_changed(self, item, column):
+        self.set_tree_changed_connection_enabled(False)
+        try:
+            self.apply_tree_item_edit(item, column)
+        finally:
+            self.set_tree_changed_connection_enabled(True)
+            # an edit that raises must not leave the tree disconnected
+
+    def apply_tree_item_edit(self, item, column):
+        """
+        Write an edited cell back to its node in one undo step. A rejected
+        edit puts the stored value back in the cell.
+        """
+        node = self.get_tree_item_node(item)
+        original_value = item.data(column, self.VALUE_ROLE)
+
+        if not node:
+            om.MGlobal.displayWarning("Node no longer exists, refresh the view")
+        elif column == 1:
+            if item.text(1) != original_value:
+                try:
+                    with undo_journal.Transaction("renameNode") as transaction:
+                        original_value = transaction.rename(node, item.text(1))
+                except RuntimeError as e:
+                    om.MGlobal.displayWarning("Could not rename {0}: {1}".format(original_value, e))
+                    # invalid name, locked or referenced node
+                item.setText(1, original_value)
+                item.setData(1, self.VALUE_ROLE, original_value)
+        else:
+            attr_name = "{0}.{1}".format(node, TransformSnapshot.COLUMNS[column - 1] if column else "visibility")
+            try:
+                with undo_journal.Transaction("setTransform") as transaction:
+                    if column == 0:
+                        transaction.set_attr(attr_name, item.checkState(0) == QtCore.Qt.Checked)
+                    else:
+                        transaction.set_attr(attr_name, float(item.text(column)))
+                original_value = cmds.getAttr(attr_name)
+            except (ValueError, RuntimeError):
+                pass
+
+            if column == 0:
+                item.setCheckState(0, QtCore.Qt.Checked if original_value else QtCore.Qt.Unchecked)
+            else:
+                item.setText(column, self.float_to_string(original_value))
+            item.setData(column, self.VALUE_ROLE, original_value)
+
     def refresh_table(self):
         self.set_cell_changed_connection_enabled(False)
 
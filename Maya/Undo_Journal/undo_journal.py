@@ -0,0 +1,287 @@
+"""
+Undo handling shared by the tools.
+
+Every tool operation runs inside a Transaction, which turns it into exactly
+one entry in Maya's undo queue. Very large batches can instead run with undo
+recording suspended; the Transaction then keeps its own Journal of
+before/after values so the whole batch can still be reverted in one step.
+
+Usage:
+    import undo_journal
+
+    with undo_journal.Transaction("rename", batch_size=len(nodes)) as transaction:
+        for node in nodes:
+            transaction.rename(node, "new_name")
+
+    undo_journal.undo()  # reverts the last tool operation, whichever way it was recorded
+
+    settable, skipped = undo_journal.split_settable(["pCube1.visibility", "pCube2.visibility"])
+    failed = undo_journal.eval_batched(commands, 5000)  # statements that raised
+"""
+
+import maya.api.OpenMaya as om2
+import maya.cmds as cmds
+import maya.mel as mel
+
+
+class Journal(object):
+    """
+    Before/after values of one transaction, enough to revert it without
+    Maya's undo queue. Only the first "before" and last "after" value of
+    each plug, node or key is kept.
+    """
+
+    def __init__(self, name):
+        self.name = name
+        self.attrs = {}
+        # plug -> [before, after]
+        self.renames = {}
+        # node uuid -> [old name, new name]
+        self.keys = {}
+        # (plug, time) -> [value before or None if there was no key, value after]
+        self.namespaces = []
+        # [(old namespace, new namespace, reference file or None)] in the order they were renamed
+
+    def record_attr(self, plug, before, after):
+        self.record(self.attrs, plug, before, after)
+
+    def record_rename(self, uuid, old_name, new_name):
+        self.record(self.renames, uuid, old_name, new_name)
+
+    def record_key(self, plug, time, before, after):
+        self.record(self.keys, (plug, time), before, after)
+
+    def record_namespace(self, old_namespace, new_namespace, reference_file=None):
+        self.namespaces.append((old_namespace, new_namespace, reference_file))
+
+    def record(self, entries, key, before, after):
+        if key in entries:
+            entries[key][1] = after
+        else:
+            entries[key] = [before, after]
+
+    def is_empty(self):
+        return not (self.attrs or self.renames or self.keys or self.namespaces)
+
+    def revert(self):
+        with Transaction("revert " + self.name, record_undo=False, journal=False):
+            for old_namespace, new_namespace, reference_file in reversed(self.namespaces):
+                rename_namespace(new_namespace, old_namespace, reference_file)
+                # before the node renames, their old names may use the old namespace
+
+            for plug, (before, after) in self.attrs.items():
+                if isinstance(before, (list, tuple)):
+                    cmds.setAttr(plug, *before)
+                else:
+                    cmds.setAttr(plug, before)
+
+            for uuid, (old_name, new_name) in self.renames.items():
+                nodes = cmds.ls(uuid, long=True)
+                if nodes:
+                    cmds.rename(nodes[0], old_name)
+
+            for (plug, time), (before, after) in self.keys.items():
+                if before is None:
+                    cmds.cutKey(plug, time=(time, time), option="keys")
+                else:
+                    cmds.setKeyframe(plug, time=time, value=before)
+
+
+class Transaction(object):
+    """
+    Context manager grouping everything done inside it into one undo step.
+
+    With record_undo=False (or a batch_size at or above SUSPEND_THRESHOLD)
+    Maya's undo recording is switched off for the block and the changes made
+    through set_attr/rename/set_keyframe/rename_namespace are journaled
+    instead. Anything else would be lost to undo, so eval_batched refuses to
+    run inside a journaled transaction.
+    """
+
+    SUSPEND_THRESHOLD = 5000
+    MAX_HISTORY = 20
+
+    history = []
+    # one Transaction per finished tool operation, reverted from its journal
+    # or, without one, through Maya's undo queue
+    active = []
+    # transactions currently open, innermost last
+
+    def __init__(self, name, batch_size=0, record_undo=None, journal=True):
+        self.name = name
+        if record_undo is None:
+            record_undo = batch_size < self.SUSPEND_THRESHOLD
+
+        self.record_undo = record_undo
+        self.journal = Journal(name) if journal and not record_undo else None
+        self.reverted = False
+
+    def __enter__(self):
+        Transaction.active.append(self)
+        if self.record_undo:
+            cmds.undoInfo(openChunk=True, chunkName=self.name)
+        else:
+            self.undo_state = cmds.undoInfo(query=True, state=True)
+            cmds.undoInfo(stateWithoutFlush=False)
+
+        return self
+
+    def __exit__(self, *args):
+        Transaction.active.remove(self)
+        if self.record_undo:
+            cmds.undoInfo(closeChunk=True)
+            if cmds.undoInfo(query=True, undoName=True) == self.name:
+                self.push_history(self)
+                # an empty chunk leaves nothing in Maya's queue for undo() to pop
+        else:
+            cmds.undoInfo(stateWithoutFlush=self.undo_state)
+            if self.journal and not self.journal.is_empty():
+                self.push_history(self)
+
+        return False
+
+    @classmethod
+    def push_history(cls, entry):
+        cls.history.append(entry)
+        del cls.history[:-cls.MAX_HISTORY]
+
+    @classmethod
+    def is_journaling(cls):
+        """
+        True inside a transaction that records its own journal instead of Maya's undo queue
+        """
+        return any(transaction.journal is not None for transaction in cls.active)
+
+    def forget(self):
+        """
+        Drop this transaction from the history, for operations reverted by other means
+        """
+        if self in Transaction.history:
+            Transaction.history.remove(self)
+
+    def revert(self):
+        if self.journal:
+            self.journal.revert()
+        else:
+            cmds.undo()
+        self.reverted = True
+
+    def set_attr(self, plug, *values):
+        if self.journal:
+            before = cmds.getAttr(plug)
+            if isinstance(before, list):
+                before = before[0]
+                # compound attributes come back as [(x, y, z)]
+            self.journal.record_attr(plug, before, values if len(values) > 1 else values[0])
+
+        cmds.setAttr(plug, *values)
+
+    def rename(self, node, new_name):
+        if self.journal:
+            uuid = cmds.ls(node, uuid=True)[0]
+            old_name = node.split("|")[-1]
+
+        actual_name = cmds.rename(node, new_name)
+
+        if self.journal:
+            self.journal.record_rename(uuid, old_name, actual_name)
+
+        return actual_name
+
+    def set_keyframe(self, plug, time, value):
+        if self.journal:
+            before = cmds.keyframe(plug, query=True, time=(time, time), valueChange=True)
+            self.journal.record_key(plug, time, before[0] if before else None, value)
+
+        cmds.setKeyframe(plug, time=time, value=value)
+
+    def rename_namespace(self, old_namespace, new_namespace, reference_file=None):
+        rename_namespace(old_namespace, new_namespace, reference_file)
+
+        if self.journal:
+            self.journal.record_namespace(old_namespace, new_namespace, reference_file)
+
+
+def rename_namespace(old_namespace, new_namespace, reference_file=None):
+    """
+    Rename a namespace (full paths without the leading ":"), on the reference
+    itself when reference_file is given
+    """
+    if reference_file:
+        cmds.file(reference_file, edit=True, namespace=new_namespace)
+    else:
+        parent = old_namespace.rpartition(":")[0]
+        cmds.namespace(rename=(":" + old_namespace, new_namespace.rpartition(":")[2]), parent=":" + parent)
+
+
+def undo():
+    """
+    Revert the last tool operation: from its journal if it ran without undo
+    recording, otherwise through Maya's undo queue
+    """
+    if Transaction.history:
+        Transaction.history.pop().revert()
+    else:
+        cmds.undo()
+
+
+def is_settable(plug):
+    """
+    False for plugs setAttr would raise on: locked, driven by a connection
+    (on the plug or any of its children) or on a node from a referenced file
+    """
+    if plug.isLocked or plug.isDestination:
+        return False
+    if om2.MFnDependencyNode(plug.node()).isFromReferencedFile:
+        return False
+    if plug.isCompound:
+        return all(is_settable(plug.child(i)) for i in range(plug.numChildren()))
+    return True
+
+
+def split_settable(plugs):
+    """
+    Splits plug names into (settable, skipped) with one API lookup per plug,
+    missing plugs are skipped
+    """
+    settable = []
+    skipped = []
+    for name in plugs:
+        selection = om2.MSelectionList()
+        try:
+            selection.add(name)
+            plug = selection.getPlug(0)
+        except (RuntimeError, TypeError):
+            skipped.append(name)
+            continue
+
+        if is_settable(plug):
+            settable.append(name)
+        else:
+            skipped.append(name)
+
+    return settable, skipped
+
+
+def eval_batched(commands, batch_size):
+    """
+    Runs MEL statements batch_size at a time. A batch that raises is run again
+    one statement at a time so the rest of it still applies; returns the
+    statements that failed
+    """
+    if Transaction.is_journaling():
+        raise RuntimeError("MEL batches cannot be journaled, run them in a transaction that records undo")
+
+    failed = []
+    for i in range(0, len(commands), batch_size):
+        batch = commands[i:i + batch_size]
+        try:
+            mel.eval("".join(batch))
+        except RuntimeError:
+            for command in batch:
+                try:
+                    mel.eval(command)
+                except RuntimeError:
+                    failed.append(command)
+
+    return failed
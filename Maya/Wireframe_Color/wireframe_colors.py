@@ -1,68 +1,365 @@
 import maya.cmds as cmds
+import maya.mel as mel
 import maya.OpenMaya as om
+import maya.api.OpenMaya as om2
+import array
+import colorsys
+import math
+import os
 import random as random
+import sys
+import time
 
-class WireframeColors(object):
-''' 
-This class is responsible for the functionality of our tool
-'''
+SHARED_DIRS = ["Undo_Journal"]
+# folders of the shared modules, next to this tool's folder. The shelf launcher
+# adds them itself, this covers running the file on its own
+if "__file__" in globals():
+    for shared_dir in SHARED_DIRS:
+        shared_path = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), shared_dir)
+        if shared_path not in sys.path:
+            sys.path.append(shared_path)
+    # code pasted into the script editor has no __file__, see the README
+
+import undo_journal
+
+class BulkColorEngine(object):
+    '''
+    Applies wireframe color overrides to many objects at once
+    '''
+
+    BATCH_SIZE = 5000
+    # number of objects per mel.eval call, keeps the command strings a sane size
 
     @classmethod
-    def set_color(cls, color_values):
+    def get_valid_nodes(cls):
+        return cmds.ls(selection=True, type=("transform", "shape"), long=True) or []
+        # one query, components and non-DAG nodes are filtered out
+
+    @classmethod
+    def uniform_colors(cls, color_values, count):
+        return array.array("f", [color_values[0], color_values[1], color_values[2]] * count)
+        # flat RGBRGB... array, one triplet per object
+
+    @classmethod
+    def apply_colors(cls, nodes, colors):
+        settable = cls.get_settable(nodes, ("overrideEnabled", "overrideRGBColors", "overrideColorRGB"))
+        commands = []
+        for i, node in enumerate(nodes):
+            if node in settable:
+                commands.append('setAttr "{0}.overrideEnabled" 1;setAttr "{0}.overrideRGBColors" 1;setAttr "{0}.overrideColorRGB" {1} {2} {3};'.format(
+                    node, colors[i * 3], colors[i * 3 + 1], colors[i * 3 + 2]))
+                # colors stay indexed by the position in nodes, skipped nodes just leave a gap
+
+        return cls.run_batched(commands, "Colored", len(nodes) - len(commands))
+
+    @classmethod
+    def reset(cls, nodes):
+        settable = cls.get_settable(nodes, ("overrideEnabled", "overrideRGBColors"))
+        commands = ['setAttr "{0}.overrideRGBColors" 0;setAttr "{0}.overrideEnabled" 0;'.format(node) for node in nodes if node in settable]
+
+        return cls.run_batched(commands, "Reset", len(nodes) - len(commands))
+
+    @classmethod
+    def get_settable(cls, nodes, attrs):
+        '''
+        Nodes whose override plugs can all be set, locked, connected and
+        referenced ones are reported and left out of the batch
+        '''
+        settable, skipped = undo_journal.split_settable(["{0}.{1}".format(node, attr) for node in nodes for attr in attrs])
+        skipped_nodes = set(plug.rsplit(".", 1)[0] for plug in skipped)
+
+        if skipped_nodes:
+            om.MGlobal.displayWarning("Skipped {0} objects with locked, connected or referenced override attributes: {1}".format(
+                len(skipped_nodes), ", ".join(sorted(skipped_nodes)[:10])))
+
+        return set(nodes) - skipped_nodes
+
+    @classmethod
+    def run_batched(cls, commands, action, skipped=0):
+        start = time.time()
+
+        with undo_journal.Transaction("wireframeColors"):
+            failed = undo_journal.eval_batched(commands, cls.BATCH_SIZE)
+
+        if failed:
+            om.MGlobal.displayWarning("{0} objects could not be changed: {1}".format(len(failed), failed[0]))
+
+        report = {"objects": len(commands) - len(failed), "skipped": skipped + len(failed), "seconds": time.time() - start}
+        om.MGlobal.displayInfo("{0} {1} objects in {2:.3f}s".format(action, report["objects"], report["seconds"]))
+        return report
+
+
+class DistinctPalette(object):
+    '''
+    Generates N well separated colors and hands them out so that objects
+    close to each other get contrasting colors
+    '''
+
+    GOLDEN_RATIO = 0.618033988749895
+    BANDS = [(0.95, 0.85), (0.65, 1.0), (1.0, 0.55)]
+    # (saturation, value) pairs cycled per color so neighbouring hues also differ in brightness
+    CANDIDATES = 6
+    # how many upcoming palette colors are considered for each object
+    CONTRAST = 1.0
+    # redmean distance (0 - 9) above which a color is taken without looking further
+
+    @classmethod
+    def generate(cls, count, start_hue=0.0):
+        hsv_to_rgb = colorsys.hsv_to_rgb
+        bands = cls.BANDS
+        colors = []
+        for i in range(count):
+            saturation, value = bands[i % len(bands)]
+            colors.extend(hsv_to_rgb((start_hue + i * cls.GOLDEN_RATIO) % 1.0, saturation, value))
+            # golden ratio steps spread the hues evenly for any count
+
+        return array.array("f", colors)
+
+    @classmethod
+    def get_centers(cls, nodes):
+        '''
+        World space bounding box centers and radii, read through the API in one pass
+        '''
+        selection_list = om2.MSelectionList()
+        for node in nodes:
+            selection_list.add(node)
+
+        centers = []
+        radii = []
+        for i in range(selection_list.length()):
+            dag_path = selection_list.getDagPath(i)
+            bounding_box = om2.MFnDagNode(dag_path).boundingBox
+            bounding_box.transformUsing(dag_path.exclusiveMatrix())
+            center = bounding_box.center
+            centers.append((center.x, center.y, center.z))
+            radii.append(max(bounding_box.width, bounding_box.height, bounding_box.depth) * 0.5)
+
+        return centers, radii
+
+    @classmethod
+    def assign(cls, centers, radii, start_hue=0.0):
+        '''
+        Return a flat RGB array with one color per center. Centers are bucketed
+        in a grid of roughly object sized cells; each object takes, out of the
+        next few palette colors, the first one that contrasts with the colors
+        last given out in its own and the 6 face adjacent cells (or the best
+        one if none does). Contrast is the "redmean" weighted RGB distance, a
+        cheap approximation of perceptual difference.
+        '''
+        count = len(centers)
+        palette = cls.generate(count, start_hue)
+        reds, greens, blues = palette[0::3].tolist(), palette[1::3].tolist(), palette[2::3].tolist()
+        order = list(range(count))
+        # palette indices not handed out yet are order[i:]
+
+        inverse_cell_size = 1.0 / max(2.0 * sum(radii) / max(count, 1), 1e-6)
+        floor = math.floor
+        grid = {}
+        # cell -> palette index of the last color given out in that cell
+
+        colors = array.array("f", [0.0]) * (count * 3)
+        for i in range(count):
+            x, y, z = centers[i]
+            cx, cy, cz = int(floor(x * inverse_cell_size)), int(floor(y * inverse_cell_size)), int(floor(z * inverse_cell_size))
+            cell = (cx, cy, cz)
+
+            neighbours = []
+            for key in (cell, (cx - 1, cy, cz), (cx + 1, cy, cz), (cx, cy - 1, cz), (cx, cy + 1, cz), (cx, cy, cz - 1), (cx, cy, cz + 1)):
+                neighbour = grid.get(key)
+                if neighbour is not None:
+                    neighbours.append(neighbour)
+
+            best = i
+            if neighbours:
+                best_distance = -1.0
+                for candidate in range(i, min(i + cls.CANDIDATES, count)):
+                    index = order[candidate]
+                    r, g, b = reds[index], greens[index], blues[index]
+                    closest = 1e9
+                    for neighbour in neighbours:
+                        dr, dg, db = r - reds[neighbour], g - greens[neighbour], b - blues[neighbour]
+                        r_mean = (r + reds[neighbour]) * 0.5
+                        distance = (2.0 + r_mean) * dr * dr + 4.0 * dg * dg + (3.0 - r_mean) * db * db
+                        if distance < closest:
+                            closest = distance
+                    if closest > best_distance:
+                        best, best_distance = candidate, closest
+                    if closest >= cls.CONTRAST:
+                        break
+
+                order[i], order[best] = order[best], order[i]
+
+            index = order[i]
+            colors[i * 3] = reds[index]
+            colors[i * 3 + 1] = greens[index]
+            colors[i * 3 + 2] = blues[index]
+            grid[cell] = index
+
+        return colors
+
 
-        selection = cmds.ls(selection=True)
+class MetricColorMap(object):
+    '''
+    Maps a per-object scalar onto a color ramp for every mesh in the scene
+    '''
 
-        for obj in selection:
-            try:
-                cmds.color( obj, rgb=(color_values[0], color_values[1], color_values[2]) )
-                # set wireframe color to the color_values passed in
-            except:
-                om.MGlobal.displayWarning("Failed to override color: {0}".format(obj))
+    METRICS = ["Poly Count", "Camera Distance", "Bounding Box Volume", "Attribute"]
+    RAMP = [(0.0, (0.0, 0.2, 1.0)), (0.35, (0.0, 1.0, 0.3)), (0.65, (1.0, 1.0, 0.0)), (1.0, (1.0, 0.0, 0.0))]
+    # low values are blue, high values are red
 
-        if not selection:
+    @classmethod
+    def get_active_camera(cls):
+        '''
+        Camera of the focused viewport, or of the first visible one
+        '''
+        panels = [cmds.getPanel(withFocus=True)] + (cmds.getPanel(visiblePanels=True) or [])
+        panels = [panel for panel in panels if panel and cmds.getPanel(typeOf=panel) == "modelPanel"]
+        return cmds.modelPanel(panels[0], query=True, camera=True) if panels else "persp"
+
+    @classmethod
+    def gather(cls, metric, attribute=None, camera=None):
+        '''
+        One sweep over every non-intermediate mesh in the scene, returns the
+        mesh transforms and one value per transform. Transforms with several
+        mesh shapes get the sum of their poly counts. Objects whose attribute
+        is not a single number are left out.
+        '''
+        shapes = cmds.ls(type="mesh", noIntermediateObjects=True, long=True) or []
+
+        if metric == "Camera Distance":
+            camera_list = om2.MSelectionList()
+            camera_list.add(camera or cls.get_active_camera())
+            camera_position = om2.MPoint() * camera_list.getDagPath(0).inclusiveMatrix()
+            # works for the camera transform or its shape
+
+        selection_list = om2.MSelectionList()
+        for shape in shapes:
+            selection_list.add(shape)
+
+        nodes = []
+        values = []
+        index_by_node = {}
+        for i in range(selection_list.length()):
+            shape_path = selection_list.getDagPath(i)
+            transform_path = om2.MDagPath(shape_path)
+            transform_path.pop()
+            node = transform_path.fullPathName()
+
+            if metric == "Poly Count":
+                value = om2.MFnMesh(shape_path).numPolygons
+            elif metric == "Attribute":
+                node_fn = om2.MFnDependencyNode(transform_path.node())
+                if not node_fn.hasAttribute(attribute):
+                    continue
+                try:
+                    value = node_fn.findPlug(attribute, False).asDouble()
+                except (RuntimeError, TypeError):
+                    continue
+                    # compound, string or message attribute
+            else:
+                bounding_box = om2.MFnDagNode(shape_path).boundingBox
+                bounding_box.transformUsing(shape_path.inclusiveMatrix())
+                if metric == "Camera Distance":
+                    value = bounding_box.center.distanceTo(camera_position)
+                else:
+                    value = bounding_box.width * bounding_box.height * bounding_box.depth
+
+            if node in index_by_node:
+                if metric == "Poly Count":
+                    values[index_by_node[node]] += value
+                continue
+
+            index_by_node[node] = len(nodes)
+            nodes.append(node)
+            values.append(value)
+
+        return nodes, values
+
+    @classmethod
+    def to_colors(cls, values):
+        '''
+        Normalize the values to 0 - 1 and look them up on the ramp, returns a flat RGB array
+        '''
+        low = min(values)
+        span = (max(values) - low) or 1.0
+
+        colors = array.array("f")
+        for value in values:
+            position = (value - low) / span
+            for k in range(1, len(cls.RAMP)):
+                if position <= cls.RAMP[k][0] or k == len(cls.RAMP) - 1:
+                    break
+
+            start_position, start_color = cls.RAMP[k - 1]
+            end_position, end_color = cls.RAMP[k]
+            blend = (position - start_position) / (end_position - start_position)
+            colors.extend([start_color[c] + (end_color[c] - start_color[c]) * blend for c in range(3)])
+
+        return colors
+
+
+class WireframeColors(object):
+    '''
+    This class is responsible for the functionality of our tool
+    '''
+
+    @classmethod
+    def set_color(cls, color_values):
+        nodes = BulkColorEngine.get_valid_nodes()
+
+        if not nodes:
             om.MGlobal.displayError("No shape nodes selected")
             return False
 
+        BulkColorEngine.apply_colors(nodes, BulkColorEngine.uniform_colors(color_values, len(nodes)))
+        # set wireframe color to the color_values passed in
+
         return True
 
     @classmethod
     def set_random_colors(cls):
+        nodes = BulkColorEngine.get_valid_nodes()
 
-        selection = cmds.ls(selection=True)
-
-        for obj in selection:
-            color = cls.random_color()
-            # generate a random color for each object
-
-            try:
-                cmds.color( obj, rgb=(color[0], color[1], color[2]) )
-                # try setting that color
-                # color stores a list of 3 values (RGB)
-            except:
-                om.MGlobal.displayWarning("Could not set wireframe color for: {0}".format(obj))
-
-        if not selection:
+        if not nodes:
             om.MGlobal.displayError("No objects selected")
             return False
 
+        centers, radii = DistinctPalette.get_centers(nodes)
+        BulkColorEngine.apply_colors(nodes, DistinctPalette.assign(centers, radii, random.random()))
+        # a distinct color for each object, contrasting with the objects next to it
+        # the random start hue gives a new set of colors every time
+
         return True
 
 
     @classmethod
     def default(cls):
-        selection = cmds.ls(selection=True)
+        nodes = BulkColorEngine.get_valid_nodes()
 
-        if not selection:
+        if not nodes:
             om.MGlobal.displayError("No objects selected")
             return False
 
-        for obj in selection:
-            try:
-                cmds.color(obj)
-                # change color to default color 
-                print obj
-            except:
-                om.MGlobal.displayWarning("Could not reset wireframe color of {0}".format(obj))
+        BulkColorEngine.reset(nodes)
+        # turn the overrides off so the default color shows again
+
+        return True
+
+    @classmethod
+    def color_by_metric(cls, metric, attribute=None):
+        if metric == "Attribute" and not attribute:
+            om.MGlobal.displayError("No attribute given")
+            return False
+
+        nodes, values = MetricColorMap.gather(metric, attribute)
+
+        if not nodes:
+            om.MGlobal.displayError("No meshes to color")
+            return False
+
+        BulkColorEngine.apply_colors(nodes, MetricColorMap.to_colors(values))
+        om.MGlobal.displayInfo("{0}: {1} - {2}".format(metric, min(values), max(values)))
+        # range of the ramp, blue is the lowest value and red the highest
 
         return True
 
@@ -74,9 +371,9 @@ This class is responsible for the functionality of our tool
 
 
 class WireframeColorsUi(object):
-'''
-This class is responsible for the UI of our tool
-'''
+    '''
+    This class is responsible for the UI of our tool
+    '''
 
     WINDOW_NAME = "WireframeColorsTool"
 
@@ -96,6 +393,13 @@ This class is responsible for the UI of our tool
         cmds.iconTextButton(style='iconAndTextVertical', image="Erase.png", label="Reset", height=50, command=self.reset)
         # create buttons in the layout and connect them to functions
 
+        self.metric_menu = cmds.optionMenu(label="Color By", changeCommand=self.update_attribute_field)
+        for metric in MetricColorMap.METRICS:
+            cmds.menuItem(label=metric)
+        self.attribute_field = cmds.textFieldGrp(label="Attribute:", columnWidth2=(60, 180), enable=False)
+        cmds.iconTextButton(style='iconAndTextVertical', image="colorProfile.png", label="Color Scene By Metric", height=50, command=self.color_by_metric_action)
+        # map a per-object value (poly count, distance, ...) to a color ramp over the whole scene
+
 
         cmds.showWindow(self.main_window)
 
@@ -106,7 +410,7 @@ This class is responsible for the UI of our tool
         WireframeColors().set_color(self.color_values)
 
     def undo(self, *args):
-        cmds.undo()
+        undo_journal.undo()
         # undoes the last command
 
     def single_random_color_action(self, *args):
@@ -117,6 +421,15 @@ This class is responsible for the UI of our tool
         WireframeColors().set_random_colors()
         # assign random colors to all wireframes
 
+    def update_attribute_field(self, *args):
+        metric = cmds.optionMenu(self.metric_menu, query=True, value=True)
+        cmds.textFieldGrp(self.attribute_field, edit=True, enable=metric == "Attribute")
+
+    def color_by_metric_action(self, *args):
+        metric = cmds.optionMenu(self.metric_menu, query=True, value=True)
+        attribute = cmds.textFieldGrp(self.attribute_field, query=True, text=True)
+        WireframeColors().color_by_metric(metric, attribute)
+
     def reset(self, *args):
         WireframeColors().default()
         # reset the wireframe colors to the default color
@@ -129,4 +442,4 @@ This class is responsible for the UI of our tool
 
 
 if __name__ == "__main__":
-    WireframeColorsUi.display()
+    WireframeColorsUi().display()